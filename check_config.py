@@ -3,24 +3,46 @@
 简单配置检查脚本
 '''
 
-import os
 import json
+import os
+
+try:
+    # 可选：更快的JSON解析
+    import orjson
+except ImportError:
+    orjson = None
+
+WRAPPER = "bin/calculator-mcp"
+SERVER_FILE = "mcp/calculator/calculator_mcp.py"
+
+def load_json_bytes(data):
+    '''解析 JSON 字节串；有 orjson 时优先使用，解析失败时交给标准库，错误信息与之前一致'''
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
 
 def main():
     print("检查 MCP 服务器配置...")
     
+    # 一次 scandir 获取当前目录下的所有条目，代替逐个 stat
+    with os.scandir(".") as it:
+        entries = {e.name: e for e in it}
+    
     # 检查 LLM 配置文件
-    if os.path.exists("config.json"):
+    if "config.json" in entries:
         print("✅ config.json 存在")
     else:
         print("❌ config.json 不存在")
 
     # 检查 MCP 配置文件
-    if os.path.exists("mcp.json"):
+    if "mcp.json" in entries:
         print("✅ mcp.json 存在")
         try:
-            with open("mcp.json", "r") as f:
-                config = json.load(f)
+            with open("mcp.json", "rb") as f:
+                config = load_json_bytes(f.read())
             
             # 检查 MCP 服务器配置
             if "mcp_servers" in config:
@@ -38,7 +60,7 @@ def main():
     
     # 检查包装器脚本
     print("\n检查包装器脚本...")
-    wrapper = "bin/calculator-mcp"
+    wrapper = WRAPPER
     if os.path.exists(wrapper):
         print(f"✅ {wrapper} 存在")
         # 检查文件内容
@@ -53,7 +75,7 @@ def main():
     
     # 检查 MCP 服务器文件
     print("\n检查 MCP 服务器文件...")
-    server_file = "mcp/calculator/calculator_mcp.py"
+    server_file = SERVER_FILE
     if os.path.exists(server_file):
         print(f"✅ {server_file} 存在")
     else:
@@ -8,6 +8,17 @@ programmatically.
 
 import asyncio
 import json
+import math
+import sys
+from dataclasses import dataclass
+
+try:
+    # Optional: faster decoding of JSON tool responses
+    import orjson
+except ImportError:
+    orjson = None
+
+import numpy as np
 from calculator_mcp import (
     calculator_basic_operation,
     calculator_advanced_math,
@@ -28,103 +39,131 @@ from calculator_mcp import (
     LengthUnit,
     WeightUnit
 )
+from fast_math import fast_trig, quick_result, TRIG_OP_CODES
+
+# Enum members used repeatedly by the demos, resolved once at import
+_JSON = ResponseFormat.JSON
+_MARKDOWN = ResponseFormat.MARKDOWN
+_POWER = AdvancedOperationType.POWER
+_LENGTH = UnitType.LENGTH
+_METER = LengthUnit.METER
+_FOOT = LengthUnit.FOOT
+
+# Validated once; model_copy(update=...) derives per-call inputs without
+# re-running validation, so updates must already have the field types
+_BASE_POWER = AdvancedMathInput(
+    operation=_POWER,
+    value=0,
+    response_format=_JSON
+)
+
+@dataclass(frozen=True, slots=True)
+class RenovationPlan:
+    '''Room and tile figures shared by the steps of the renovation scenario.'''
+    length_m: float
+    width_m: float
+    box_coverage_m2: float
+
+RENOVATION_PLAN = RenovationPlan(length_m=5.5, width_m=4.2, box_coverage_m2=2.5)
+
+# Local conversions for demo values that are only needed as numbers; the
+# factors match those used by calculator_unit_conversion
+LENGTH_FACTORS = {
+    (LengthUnit.METER, LengthUnit.FOOT): 1 / 0.3048
+}
+
+TEMPERATURE_CONVERSIONS = {
+    (TemperatureUnit.CELSIUS, TemperatureUnit.FAHRENHEIT): lambda c: c * 9/5 + 32
+}
 
 async def demonstrate_basic_operations():
     '''Demonstrate basic arithmetic operations.'''
-    print("=== Basic Arithmetic Operations ===\n")
+    out = []
+    out.append("=== Basic Arithmetic Operations ===\n")
     
     # Example 1: Simple addition
-    print("1. Addition: 12.5 + 7.3")
+    out.append("1. Addition: 12.5 + 7.3")
     params = BasicOperationInput(
         operation=OperationType.ADD,
         a=12.5,
         b=7.3,
-        response_format=ResponseFormat.MARKDOWN
+        response_format=_MARKDOWN
     )
     result = await calculator_basic_operation(params)
-    print(result)
-    print()
+    out.append(result)
+    out.append("")
     
     # Example 2: Division with error handling
-    print("2. Division: 20 / 4")
+    out.append("2. Division: 20 / 4")
     params = BasicOperationInput(
         operation=OperationType.DIVIDE,
         a=20,
         b=4,
-        response_format=ResponseFormat.JSON
+        response_format=_JSON
     )
     result = await calculator_basic_operation(params)
-    print(json.loads(result))
-    print()
+    out.append(str(orjson.loads(result) if orjson is not None else json.loads(result)))
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 async def demonstrate_advanced_math():
     '''Demonstrate advanced mathematical functions.'''
-    print("=== Advanced Mathematical Functions ===\n")
+    out = []
+    out.append("=== Advanced Mathematical Functions ===\n")
     
     # Example 1: Calculate area of circle (πr²)
-    print("1. Area of circle with radius 5:")
-    params = AdvancedMathInput(
-        operation=AdvancedOperationType.POWER,
-        value=5,
-        exponent=2,
-        response_format=ResponseFormat.MARKDOWN
-    )
-    radius_squared = await calculator_advanced_math(params)
-    print(f"Radius squared: {json.loads(radius_squared)['result']}")
+    out.append("1. Area of circle with radius 5:")
+    params = _BASE_POWER.model_copy(update={"value": 5.0, "exponent": 2.0})
+    radius_squared = quick_result(await calculator_advanced_math(params))
+    out.append(f"Radius squared: {radius_squared}")
     
     # Multiply by π
-    import math
-    area = json.loads(radius_squared)['result'] * math.pi
-    print(f"Area = π × r² = {area:.4f}")
-    print()
+    area = radius_squared * math.pi
+    out.append(f"Area = π × r² = {area:.4f}")
+    out.append("")
     
     # Example 2: Compound interest calculation
-    print("2. Compound interest: $1000 at 5% for 3 years")
+    out.append("2. Compound interest: $1000 at 5% for 3 years")
     principal = 1000
     rate = 0.05
     years = 3
     
     # Calculate (1 + rate)^years
-    params = AdvancedMathInput(
-        operation=AdvancedOperationType.POWER,
-        value=1 + rate,
-        exponent=years,
-        response_format=ResponseFormat.JSON
-    )
+    params = _BASE_POWER.model_copy(update={"value": 1 + rate, "exponent": float(years)})
     growth_factor = await calculator_advanced_math(params)
-    growth = json.loads(growth_factor)['result']
+    growth = quick_result(growth_factor)
     
     final_amount = principal * growth
-    print(f"Growth factor: {growth:.4f}")
-    print(f"Final amount: ${final_amount:.2f}")
-    print()
+    out.append(f"Growth factor: {growth:.4f}")
+    out.append(f"Final amount: ${final_amount:.2f}")
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 async def demonstrate_trigonometry():
     '''Demonstrate trigonometric functions.'''
-    print("=== Trigonometric Functions ===\n")
+    out = []
+    out.append("=== Trigonometric Functions ===\n")
     
     # Example 1: Right triangle calculations
-    print("1. Right triangle with angle 30°, hypotenuse 10:")
+    out.append("1. Right triangle with angle 30°, hypotenuse 10:")
     angle = 30
     hypotenuse = 10
     
-    # Calculate opposite side (hypotenuse × sin(angle))
-    params = TrigonometricInput(
-        operation=TrigonometricOperationType.SINE,
-        angle=angle,
-        use_radians=False,
-        response_format=ResponseFormat.JSON
+    # Calculate opposite side (hypotenuse × sin(angle)); only the number is
+    # needed, so use the local fast path instead of a JSON tool call
+    sin_value = fast_trig(
+        TRIG_OP_CODES[TrigonometricOperationType.SINE.value],
+        angle,
+        False
     )
-    sin_result = await calculator_trigonometric(params)
-    sin_value = json.loads(sin_result)['result']
     
     opposite = hypotenuse * sin_value
-    print(f"sin({angle}°) = {sin_value:.4f}")
-    print(f"Opposite side = {hypotenuse} × {sin_value:.4f} = {opposite:.2f}")
-    print()
+    out.append(f"sin({angle}°) = {sin_value:.4f}")
+    out.append(f"Opposite side = {hypotenuse} × {sin_value:.4f} = {opposite:.2f}")
+    out.append("")
     
     # Example 2: Angle from slope
-    print("2. Angle of slope with rise 3, run 4:")
+    out.append("2. Angle of slope with rise 3, run 4:")
     rise = 3
     run = 4
     slope = rise / run
@@ -133,63 +172,55 @@ async def demonstrate_trigonometry():
         operation=TrigonometricOperationType.ARCTANGENT,
         angle=slope,
         use_radians=False,
-        response_format=ResponseFormat.MARKDOWN
+        response_format=_MARKDOWN
     )
     result = await calculator_trigonometric(params)
-    print(result)
-    print()
+    out.append(result)
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 async def demonstrate_statistics():
     '''Demonstrate statistical calculations.'''
-    print("=== Statistical Calculations ===\n")
+    out = []
+    out.append("=== Statistical Calculations ===\n")
     
     # Example 1: Exam scores analysis
-    print("1. Exam scores analysis:")
+    out.append("1. Exam scores analysis:")
     scores = [85, 92, 78, 90, 88, 95, 82, 87, 91, 89]
     
-    # Calculate mean
-    params = StatisticsInput(
-        operation="mean",
-        values=scores,
-        response_format=ResponseFormat.JSON
-    )
-    mean_result = await calculator_statistics(params)
-    mean = json.loads(mean_result)['result']
-    
-    # Calculate standard deviation
-    params = StatisticsInput(
-        operation="stdev",
-        values=scores,
-        response_format=ResponseFormat.JSON
-    )
-    stdev_result = await calculator_statistics(params)
-    stdev = json.loads(stdev_result)['result']
+    # Only the raw numbers are needed here, so compute mean and (sample)
+    # standard deviation locally instead of two JSON tool round trips
+    arr = np.asarray(scores, dtype=np.float64)
+    mean = arr.mean()
+    stdev = arr.std(ddof=1)
     
-    print(f"Scores: {scores}")
-    print(f"Mean: {mean:.2f}")
-    print(f"Standard deviation: {stdev:.2f}")
-    print(f"Range: {min(scores)} - {max(scores)}")
-    print()
+    out.append(f"Scores: {scores}")
+    out.append(f"Mean: {mean:.2f}")
+    out.append(f"Standard deviation: {stdev:.2f}")
+    out.append(f"Range: {min(scores)} - {max(scores)}")
+    out.append("")
     
     # Example 2: Temperature data
-    print("2. Daily temperatures (°C):")
+    out.append("2. Daily temperatures (°C):")
     temperatures = [22.5, 23.1, 21.8, 24.2, 22.9, 23.5, 22.1]
     
     params = StatisticsInput(
         operation="median",
         values=temperatures,
-        response_format=ResponseFormat.MARKDOWN
+        response_format=_MARKDOWN
     )
     result = await calculator_statistics(params)
-    print(result)
-    print()
+    out.append(result)
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 async def demonstrate_unit_conversions():
     '''Demonstrate unit conversions.'''
-    print("=== Unit Conversions ===\n")
+    out = []
+    out.append("=== Unit Conversions ===\n")
     
     # Example 1: Cooking conversions
-    print("1. Cooking conversions:")
+    out.append("1. Cooking conversions:")
     
     # Convert 2 cups of flour to grams (1 cup ≈ 125g)
     cups = 2
@@ -200,104 +231,80 @@ async def demonstrate_unit_conversions():
         value=cups * grams_per_cup,
         from_unit=WeightUnit.GRAM,
         to_unit=WeightUnit.OUNCE,
-        response_format=ResponseFormat.MARKDOWN
+        response_format=_MARKDOWN
     )
     result = await calculator_unit_conversion(params)
-    print(f"{cups} cups of flour ({cups * grams_per_cup}g) in ounces:")
-    print(result)
-    print()
+    out.append(f"{cups} cups of flour ({cups * grams_per_cup}g) in ounces:")
+    out.append(result)
+    out.append("")
     
     # Example 2: Temperature for baking
-    print("2. Baking temperature conversion:")
+    out.append("2. Baking temperature conversion:")
     
-    params = UnitConversionInput(
-        unit_type=UnitType.TEMPERATURE,
-        value=180,
-        from_unit=TemperatureUnit.CELSIUS,
-        to_unit=TemperatureUnit.FAHRENHEIT,
-        response_format=ResponseFormat.JSON
-    )
-    result = await calculator_unit_conversion(params)
-    data = json.loads(result)
-    print(f"180°C (common baking temperature) = {data['result']:.1f}°F")
-    print()
+    fahrenheit = TEMPERATURE_CONVERSIONS[(TemperatureUnit.CELSIUS, TemperatureUnit.FAHRENHEIT)](180)
+    out.append(f"180°C (common baking temperature) = {fahrenheit:.1f}°F")
+    out.append("")
     
     # Example 3: Room dimensions
-    print("3. Room dimensions conversion:")
+    out.append("3. Room dimensions conversion:")
     
     params = UnitConversionInput(
-        unit_type=UnitType.LENGTH,
+        unit_type=_LENGTH,
         value=4,
-        from_unit=LengthUnit.METER,
-        to_unit=LengthUnit.FOOT,
-        response_format=ResponseFormat.MARKDOWN
+        from_unit=_METER,
+        to_unit=_FOOT,
+        response_format=_MARKDOWN
     )
     result = await calculator_unit_conversion(params)
-    print("4 meters in feet:")
-    print(result)
+    out.append("4 meters in feet:")
+    out.append(result)
+    sys.stdout.write("\n".join(out) + "\n")
 
 async def real_world_scenario():
     '''Demonstrate a real-world calculation scenario.'''
-    print("\n" + "="*60)
-    print("Real-World Scenario: Home Renovation Project")
-    print("="*60 + "\n")
-    
-    print("You're planning to install new flooring in a room that is:")
-    print("- Length: 5.5 meters")
-    print("- Width: 4.2 meters")
-    print("\nFlooring tiles are sold in boxes that cover 2.5 square meters each.")
-    print("Let's calculate how many boxes you need:\n")
+    plan = RENOVATION_PLAN
+    out = []
+    out.append("\n" + "="*60)
+    out.append("Real-World Scenario: Home Renovation Project")
+    out.append("="*60 + "\n")
+    
+    out.append("You're planning to install new flooring in a room that is:")
+    out.append(f"- Length: {plan.length_m} meters")
+    out.append(f"- Width: {plan.width_m} meters")
+    out.append(f"\nFlooring tiles are sold in boxes that cover {plan.box_coverage_m2} square meters each.")
+    out.append("Let's calculate how many boxes you need:\n")
     
     # Calculate area in square meters
     params = BasicOperationInput(
         operation=OperationType.MULTIPLY,
-        a=5.5,
-        b=4.2,
-        response_format=ResponseFormat.JSON
+        a=plan.length_m,
+        b=plan.width_m,
+        response_format=_JSON
     )
     area_result = await calculator_basic_operation(params)
-    area = json.loads(area_result)['result']
-    print(f"1. Room area: {area:.2f} square meters")
+    area = quick_result(area_result)
+    out.append(f"1. Room area: {area:.2f} square meters")
     
     # Calculate number of boxes needed
-    boxes_needed = area / 2.5
+    boxes_needed = area / plan.box_coverage_m2
     
-    params = AdvancedMathInput(
-        operation=AdvancedOperationType.CEIL,
-        value=boxes_needed,
-        response_format=ResponseFormat.JSON
-    )
-    boxes_result = await calculator_advanced_math(params)
-    boxes = json.loads(boxes_result)['result']
+    boxes = math.ceil(boxes_needed)
     
-    print(f"2. Boxes needed: {area:.2f} ÷ 2.5 = {boxes_needed:.2f}")
-    print(f"   Round up to: {boxes} boxes")
+    out.append(f"2. Boxes needed: {area:.2f} ÷ {plan.box_coverage_m2} = {boxes_needed:.2f}")
+    out.append(f"   Round up to: {boxes} boxes")
     
     # Convert to square feet for US reference
-    params = UnitConversionInput(
-        unit_type=UnitType.LENGTH,
-        value=5.5,
-        from_unit=LengthUnit.METER,
-        to_unit=LengthUnit.FOOT,
-        response_format=ResponseFormat.JSON
-    )
-    length_ft = json.loads(await calculator_unit_conversion(params))['result']
-    
-    params = UnitConversionInput(
-        unit_type=UnitType.LENGTH,
-        value=4.2,
-        from_unit=LengthUnit.METER,
-        to_unit=LengthUnit.FOOT,
-        response_format=ResponseFormat.JSON
-    )
-    width_ft = json.loads(await calculator_unit_conversion(params))['result']
+    meter_to_foot = LENGTH_FACTORS[(_METER, _FOOT)]
+    length_ft = plan.length_m * meter_to_foot
+    width_ft = plan.width_m * meter_to_foot
     
     area_ft = length_ft * width_ft
-    print(f"\n3. For reference in US measurements:")
-    print(f"   Room dimensions: {length_ft:.1f} ft × {width_ft:.1f} ft")
-    print(f"   Room area: {area_ft:.1f} square feet")
+    out.append(f"\n3. For reference in US measurements:")
+    out.append(f"   Room dimensions: {length_ft:.1f} ft × {width_ft:.1f} ft")
+    out.append(f"   Room area: {area_ft:.1f} square feet")
     
-    print("\n" + "="*60)
+    out.append("\n" + "="*60)
+    sys.stdout.write("\n".join(out) + "\n")
 
 async def main():
     '''Run all demonstrations.'''
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+'''
+Fast Math Helpers
+
+Local numeric fast paths used by the example and test scripts when only the
+raw number is needed (no Markdown formatting). Numba is optional: when it is
+installed the helpers are JIT-compiled and cached to disk, otherwise they run
+as plain Python.
+'''
+
+import json
+import math
+import re
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        '''Fallback no-op decorator used when numba is not installed.'''
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Numeric "result" field of a tool's JSON response
+_RESULT_RE = re.compile(r'"result"\s*:\s*(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\s*[,}\n]')
+
+def quick_result(response: str) -> float:
+    '''Extract the numeric result from a JSON tool response without a full parse.
+
+    Falls back to json.loads when the result is not a plain number.
+    '''
+    m = _RESULT_RE.search(response)
+    if m is not None:
+        return float(m.group(1))
+    return json.loads(response)['result']
+
+# Op codes follow the declaration order of OperationType
+BASIC_ADD = 0
+BASIC_SUBTRACT = 1
+BASIC_MULTIPLY = 2
+BASIC_DIVIDE = 3
+
+BASIC_OP_CODES = {
+    "add": BASIC_ADD,
+    "subtract": BASIC_SUBTRACT,
+    "multiply": BASIC_MULTIPLY,
+    "divide": BASIC_DIVIDE
+}
+
+# Op codes follow the declaration order of TrigonometricOperationType
+TRIG_SINE = 0
+TRIG_COSINE = 1
+TRIG_TANGENT = 2
+TRIG_ARCSINE = 3
+TRIG_ARCCOSINE = 4
+TRIG_ARCTANGENT = 5
+
+TRIG_OP_CODES = {
+    "sine": TRIG_SINE,
+    "cosine": TRIG_COSINE,
+    "tangent": TRIG_TANGENT,
+    "arcsine": TRIG_ARCSINE,
+    "arccosine": TRIG_ARCCOSINE,
+    "arctangent": TRIG_ARCTANGENT
+}
+
+@njit(cache=True)
+def basic_op(op: int, a: float, b: float) -> float:
+    '''Evaluate a basic arithmetic op code with the same semantics as calculator_basic_operation.'''
+    if op == BASIC_ADD:
+        return a + b
+    elif op == BASIC_SUBTRACT:
+        return a - b
+    elif op == BASIC_MULTIPLY:
+        return a * b
+    return a / b
+
+@njit(cache=True)
+def fast_trig(op: int, angle: float, use_radians: bool) -> float:
+    '''Evaluate a trigonometric op code with the same semantics as calculator_trigonometric.'''
+    if op <= TRIG_TANGENT:
+        x = angle if use_radians else math.radians(angle)
+        if op == TRIG_SINE:
+            return math.sin(x)
+        elif op == TRIG_COSINE:
+            return math.cos(x)
+        return math.tan(x)
+
+    if op == TRIG_ARCSINE:
+        result = math.asin(angle)
+    elif op == TRIG_ARCCOSINE:
+        result = math.acos(angle)
+    else:
+        result = math.atan(angle)
+    return result if use_radians else math.degrees(result)
+
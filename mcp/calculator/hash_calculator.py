@@ -7,16 +7,31 @@ It supports multiple hash algorithms, input types, and normalization features.
 '''
 
 import hashlib
+import hmac
+import io
 import json
 import os
 import re
-from typing import Optional, List, Dict, Any, Union, Literal
+import stat
+from typing import Optional, List, Dict, Any, Union, Literal, Tuple
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator, ConfigDict
 import zlib
 import base64
 
+try:
+    # Optional: hardware-accelerated CRC32C (SSE4.2 / ARMv8 CRC instructions)
+    import crc32c
+except ImportError:
+    crc32c = None
+
+# Patterns used by normalization, compiled once
+_CRLF_RE = re.compile(r'\r\n?')
+_NL_COLLAPSE_RE = re.compile(r'\n{3,}')
+_SPACE_COLLAPSE_RE = re.compile(r' {2,}')
+
 # Enums for hash algorithms and input types
 class HashAlgorithm(str, Enum):
     '''Supported hash algorithms.'''
@@ -28,6 +43,7 @@ class HashAlgorithm(str, Enum):
     SHA3_512 = "sha3_512"
     BLAKE2B = "blake2b"
     CRC32 = "crc32"
+    CRC32C = "crc32c"
 
 class InputType(str, Enum):
     '''Supported input types.'''
@@ -47,12 +63,20 @@ class ResponseFormat(str, Enum):
     MARKDOWN = "markdown"
     JSON = "json"
 
+def _is_hex(v: str) -> bool:
+    '''Check for a non-empty, even-length string of hex digits in one C-level pass.'''
+    try:
+        # fromhex skips whitespace between bytes; the length check rejects it
+        return bool(v) and len(bytes.fromhex(v)) * 2 == len(v)
+    except ValueError:
+        return False
+
 # Pydantic Models for Input Validation
 class HashCalculationInput(BaseModel):
     '''Input model for hash calculations.'''
     model_config = ConfigDict(
         str_strip_whitespace=True,
-        validate_assignment=True
+        frozen=True
     )
 
     algorithm: HashAlgorithm = Field(..., description="Hash algorithm to use")
@@ -61,35 +85,59 @@ class HashCalculationInput(BaseModel):
     normalization: NormalizationType = Field(default=NormalizationType.NONE, description="Normalization to apply before hashing")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="Output format")
 
+    # Results of validation reused when hashing (see _hash_params / get_params_stat)
+    _decoded: Optional[bytes] = PrivateAttr(default=None)
+    _stat: Optional[os.stat_result] = PrivateAttr(default=None)
+
     @field_validator('input_data')
     @classmethod
     def validate_input_data(cls, v: str, info) -> str:
         input_type = info.data.get('input_type')
         
-        if input_type == InputType.FILE:
-            # Check if file exists
-            if not os.path.exists(v):
-                raise ValueError(f"File not found: {v}")
-            if not os.path.isfile(v):
-                raise ValueError(f"Path is not a file: {v}")
-        elif input_type == InputType.BASE64:
-            # Validate base64 encoding
+        # FILE and HEX inputs are checked in prepare_input_data, which keeps
+        # the stat / decoded bytes
+        if input_type == InputType.BASE64:
+            # Padded base64 is always a multiple of 4 long; decoding happens
+            # once, in prepare_input_data
+            if len(v) % 4:
+                raise ValueError("Invalid base64 encoded data")
+        
+        return v
+
+    @model_validator(mode='after')
+    def prepare_input_data(self) -> 'HashCalculationInput':
+        # Keep the stat result / decoded bytes so hashing does not redo the work
+        if self.input_type == InputType.FILE:
+            # One stat answers both "exists" and "is a regular file"
             try:
-                base64.b64decode(v, validate=True)
+                st = os.stat(self.input_data)
+            except OSError:
+                raise ValueError(f"File not found: {self.input_data}")
+            if not stat.S_ISREG(st.st_mode):
+                raise ValueError(f"Path is not a file: {self.input_data}")
+            self._stat = st
+        elif self.input_type == InputType.BASE64:
+            try:
+                self._decoded = base64.b64decode(self.input_data, validate=True)
             except Exception:
                 raise ValueError("Invalid base64 encoded data")
-        elif input_type == InputType.HEX:
-            # Validate hex encoding
-            if not re.match(r'^[0-9a-fA-F]+$', v):
+        elif self.input_type == InputType.HEX:
+            # Decoding is the validation; fromhex skips whitespace between
+            # bytes, which the length check rejects
+            try:
+                decoded = bytes.fromhex(self.input_data)
+            except ValueError:
+                decoded = None
+            if not decoded or len(decoded) * 2 != len(self.input_data):
                 raise ValueError("Invalid hex encoded data")
-        
-        return v
+            self._decoded = decoded
+        return self
 
 class HashComparisonInput(BaseModel):
     '''Input model for hash comparisons.'''
     model_config = ConfigDict(
         str_strip_whitespace=True,
-        validate_assignment=True
+        frozen=True
     )
 
     algorithm: HashAlgorithm = Field(..., description="Hash algorithm to use")
@@ -104,31 +152,93 @@ class HashComparisonInput(BaseModel):
     def validate_expected_hash(cls, v: str) -> str:
         # Remove any whitespace and convert to lowercase
         v = v.strip().lower()
-        if not re.match(r'^[0-9a-f]+$', v):
+        if not _is_hex(v):
             raise ValueError("Expected hash must be a hexadecimal string")
         return v
 
 # Normalization functions
+# Reused for every call; json.dumps with non-default options builds a new encoder each time
+_CANONICAL_JSON_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'))
+
 def normalize_json(data: str) -> bytes:
     '''Normalize JSON data by sorting keys and removing whitespace.'''
     try:
         parsed = json.loads(data)
-        normalized = json.dumps(parsed, sort_keys=True, separators=(',', ':'))
-        return normalized.encode('utf-8')
+        return _CANONICAL_JSON_ENCODER.encode(parsed).encode('utf-8')
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON data: {str(e)}")
 
+# Texts longer than this use the compiled single-pass normalizer when available
+JIT_NORMALIZE_MIN_CHARS = 4096
+
+# Optional numpy/numba are imported on the first long text, not at module
+# import; None until then, False when they are not installed
+np = None
+_jit_normalize_text_bytes = None
+
+def _get_jit_normalizer():
+    '''Return the compiled normalizer, importing numpy/numba on first use; None if unavailable.'''
+    global np, _jit_normalize_text_bytes
+    if _jit_normalize_text_bytes is None:
+        try:
+            import numpy
+            from numba import njit
+        except ImportError:
+            _jit_normalize_text_bytes = False
+        else:
+            np = numpy
+            _jit_normalize_text_bytes = njit(cache=True)(_normalize_text_bytes)
+    return _jit_normalize_text_bytes or None
+
+def _normalize_text_bytes(buf):
+    '''Single pass over UTF-8 bytes: CRLF/CR -> LF, cap LF runs at 2, collapse space runs.'''
+    n = buf.shape[0]
+    out = np.empty(n, dtype=np.uint8)
+    o = 0
+    newline_run = 0
+    in_spaces = False
+    i = 0
+    while i < n:
+        c = buf[i]
+        if c == 13:
+            c = 10
+            if i + 1 < n and buf[i + 1] == 10:
+                i += 1
+        if c == 10:
+            newline_run += 1
+            in_spaces = False
+            if newline_run <= 2:
+                out[o] = 10
+                o += 1
+        elif c == 32:
+            newline_run = 0
+            if not in_spaces:
+                out[o] = 32
+                o += 1
+            in_spaces = True
+        else:
+            newline_run = 0
+            in_spaces = False
+            out[o] = c
+            o += 1
+        i += 1
+    return out[:o]
+
 def normalize_text(data: str) -> bytes:
     '''Normalize text data by removing extra whitespace and normalizing line endings.'''
-    # Remove leading/trailing whitespace
+    # str.strip handles Unicode whitespace, so it stays outside the byte loop
     data = data.strip()
-    # Normalize line endings to \n
-    data = re.sub(r'\r\n|\r', '\n', data)
-    # Remove multiple consecutive newlines
-    data = re.sub(r'\n{3,}', '\n\n', data)
-    # Remove multiple consecutive spaces
-    data = re.sub(r' {2,}', ' ', data)
-    return data.encode('utf-8')
+    if len(data) > JIT_NORMALIZE_MIN_CHARS:
+        normalizer = _get_jit_normalizer()
+        if normalizer is not None:
+            # \r, \n and space never occur inside multi-byte UTF-8 sequences
+            buf = np.frombuffer(data.encode('utf-8'), dtype=np.uint8)
+            return normalizer(buf).tobytes()
+    
+    # Normalize line endings to \n, then collapse newline and space runs
+    data = _CRLF_RE.sub('\n', data)
+    data = _NL_COLLAPSE_RE.sub('\n\n', data)
+    return _SPACE_COLLAPSE_RE.sub(' ', data).encode('utf-8')
 
 def normalize_data(data: bytes, normalization: NormalizationType) -> bytes:
     '''Apply normalization to data based on the specified type.'''
@@ -145,28 +255,54 @@ def normalize_data(data: bytes, normalization: NormalizationType) -> bytes:
         return data
 
 # Hash calculation functions
+# hashlib constructors by algorithm; the CRC variants are handled separately
+_HASHERS = {
+    HashAlgorithm.MD5: hashlib.md5,
+    HashAlgorithm.SHA1: hashlib.sha1,
+    HashAlgorithm.SHA256: hashlib.sha256,
+    HashAlgorithm.SHA512: hashlib.sha512,
+    HashAlgorithm.SHA3_256: hashlib.sha3_256,
+    HashAlgorithm.SHA3_512: hashlib.sha3_512,
+    HashAlgorithm.BLAKE2B: hashlib.blake2b
+}
+
 def calculate_hash(data: bytes, algorithm: HashAlgorithm) -> str:
     '''Calculate hash of data using the specified algorithm.'''
-    if algorithm == HashAlgorithm.MD5:
-        return hashlib.md5(data).hexdigest()
-    elif algorithm == HashAlgorithm.SHA1:
-        return hashlib.sha1(data).hexdigest()
-    elif algorithm == HashAlgorithm.SHA256:
-        return hashlib.sha256(data).hexdigest()
-    elif algorithm == HashAlgorithm.SHA512:
-        return hashlib.sha512(data).hexdigest()
-    elif algorithm == HashAlgorithm.SHA3_256:
-        return hashlib.sha3_256(data).hexdigest()
-    elif algorithm == HashAlgorithm.SHA3_512:
-        return hashlib.sha3_512(data).hexdigest()
-    elif algorithm == HashAlgorithm.BLAKE2B:
-        return hashlib.blake2b(data).hexdigest()
-    elif algorithm == HashAlgorithm.CRC32:
-        # CRC32 returns an integer, convert to hex
-        crc_value = zlib.crc32(data) & 0xffffffff
-        return f"{crc_value:08x}"
-    else:
+    return calculate_digest(data, algorithm).hex()
+
+def calculate_digest(data: bytes, algorithm: HashAlgorithm) -> bytes:
+    '''Calculate the raw digest of data; CRC values are returned as 4 big-endian bytes.'''
+    if algorithm == HashAlgorithm.CRC32:
+        return (zlib.crc32(data) & 0xffffffff).to_bytes(4, 'big')
+    if algorithm == HashAlgorithm.CRC32C:
+        return _crc32c(data).to_bytes(4, 'big')
+    hasher = _HASHERS.get(algorithm)
+    if hasher is None:
         raise ValueError(f"Unsupported algorithm: {algorithm}")
+    return hasher(data).digest()
+
+def _crc32c(data: bytes, value: int = 0) -> int:
+    '''Update a CRC32C (Castagnoli) value; needs the optional crc32c package.'''
+    if crc32c is None:
+        raise ValueError("CRC32C requires the 'crc32c' package (pip install crc32c)")
+    return crc32c.crc32c(data, value)
+
+# Read size for streaming file hashes
+HASH_CHUNK_SIZE = 1 << 20
+
+def calculate_hash_stream(path: str, algorithm: HashAlgorithm, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    '''Calculate hash of a file by streaming it in chunks instead of reading it whole.'''
+    with open(path, 'rb') as f:
+        if algorithm in (HashAlgorithm.CRC32, HashAlgorithm.CRC32C):
+            update = zlib.crc32 if algorithm == HashAlgorithm.CRC32 else _crc32c
+            crc_value = 0
+            while buf := f.read(chunk_size):
+                crc_value = update(buf, crc_value)
+            return f"{crc_value & 0xffffffff:08x}"
+        hasher = _HASHERS[algorithm]()
+        while buf := f.read(chunk_size):
+            hasher.update(buf)
+        return hasher.hexdigest()
 
 def get_input_data(input_type: InputType, input_data: str) -> bytes:
     '''Get bytes from input based on input type.'''
@@ -182,39 +318,89 @@ def get_input_data(input_type: InputType, input_data: str) -> bytes:
     else:
         raise ValueError(f"Unsupported input type: {input_type}")
 
+def _hash_source(
+    algorithm: HashAlgorithm,
+    input_type: InputType,
+    input_data: str,
+    normalization: NormalizationType,
+    decoded: Optional[bytes] = None,
+    st: Optional[os.stat_result] = None
+) -> Tuple[str, int, int]:
+    '''Hash one input, returning (hash, input size, normalized size).
+
+    decoded and st are bytes or a stat result already obtained during
+    validation. Un-normalized files are hashed without being read into memory;
+    other inputs are materialized because normalization needs the full text.
+    '''
+    if input_type == InputType.FILE and normalization == NormalizationType.NONE:
+        if st is None:
+            st = os.stat(input_data)
+        return calculate_hash_stream(input_data, algorithm), st.st_size, st.st_size
+    
+    data = decoded if decoded is not None else get_input_data(input_type, input_data)
+    if normalization == NormalizationType.NONE:
+        return calculate_hash(data, algorithm), len(data), len(data)
+    
+    normalized_data = normalize_data(data, normalization)
+    return calculate_hash(normalized_data, algorithm), len(data), len(normalized_data)
+
+def _hash_params(params: Union[HashCalculationInput, HashComparisonInput]) -> Tuple[str, int, int]:
+    '''Hash validated params, reusing anything cached on them during validation.'''
+    return _hash_source(
+        params.algorithm,
+        params.input_type,
+        params.input_data,
+        params.normalization,
+        decoded=getattr(params, '_decoded', None),
+        st=getattr(params, '_stat', None)
+    )
+
+def get_params_stat(params: Union[HashCalculationInput, HashComparisonInput]) -> os.stat_result:
+    '''Get the stat result of a FILE input, reusing the one taken during validation.'''
+    st = getattr(params, '_stat', None)
+    if st is not None:
+        return st
+    return os.stat(params.input_data)
+
 # Formatting functions
+def _emit_details(w, details: Dict[str, Any]) -> None:
+    '''Write the markdown details section through the write function w.'''
+    for key, value in details.items():
+        label = key.replace('_', ' ').title()
+        if isinstance(value, list):
+            w(f"- **{label}**:\n")
+            for item in value:
+                w(f"  - {item}\n")
+        elif isinstance(value, dict):
+            w(f"- **{label}**:\n")
+            for k, v in value.items():
+                w(f"  - **{k}**: {v}\n")
+        elif isinstance(value, float):
+            w(f"- **{label}**: {value:.6f}\n")
+        else:
+            w(f"- **{label}**: {value}\n")
+    w("\n")
+
 def _format_result_markdown(operation: str, result: Union[str, Dict[str, Any]], details: Dict[str, Any] = None) -> str:
     '''Format result as markdown.'''
-    lines = [f"# {operation}", ""]
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# {operation}\n\n")
     
     if details:
-        for key, value in details.items():
-            if isinstance(value, (list, dict)):
-                lines.append(f"- **{key.replace('_', ' ').title()}**:")
-                if isinstance(value, list):
-                    for item in value:
-                        lines.append(f"  - {item}")
-                else:
-                    for k, v in value.items():
-                        lines.append(f"  - **{k}**: {v}")
-            elif isinstance(value, float):
-                lines.append(f"- **{key.replace('_', ' ').title()}**: {value:.6f}")
-            else:
-                lines.append(f"- **{key.replace('_', ' ').title()}**: {value}")
-        lines.append("")
+        _emit_details(w, details)
     
     if isinstance(result, dict):
-        lines.append("## Results:")
+        w("## Results:")
         for key, value in result.items():
-            lines.append(f"- **{key}**: {value}")
+            w(f"\n- **{key}**: {value}")
     else:
-        lines.append(f"## Result: **{result}**")
+        w(f"## Result: **{result}**")
     
-    return "\n".join(lines)
+    return buf.getvalue()
 
 def _format_result_json(operation: str, result: Union[str, Dict[str, Any]], details: Dict[str, Any] = None) -> str:
     '''Format result as JSON.'''
-    import json
     response = {
         "operation": operation,
         "result": result,
@@ -226,27 +412,20 @@ def _format_result_json(operation: str, result: Union[str, Dict[str, Any]], deta
 def calculate_hash_wrapper(params: HashCalculationInput) -> str:
     '''Calculate hash of input data with optional normalization.'''
     try:
-        # Get input data
-        data = get_input_data(params.input_type, params.input_data)
-        
-        # Apply normalization if requested
-        normalized_data = normalize_data(data, params.normalization)
-        
-        # Calculate hash
-        hash_value = calculate_hash(normalized_data, params.algorithm)
+        hash_value, input_size, normalized_size = _hash_params(params)
         
         # Prepare details
         details = {
             "algorithm": params.algorithm.value,
             "input_type": params.input_type.value,
             "normalization": params.normalization.value,
-            "input_size_bytes": len(data),
-            "normalized_size_bytes": len(normalized_data) if params.normalization != NormalizationType.NONE else len(data)
+            "input_size_bytes": input_size,
+            "normalized_size_bytes": normalized_size
         }
         
         if params.input_type == InputType.FILE:
             details["file_path"] = params.input_data
-            details["file_size"] = os.path.getsize(params.input_data)
+            details["file_size"] = get_params_stat(params).st_size
         
         # Format response
         if params.response_format == ResponseFormat.MARKDOWN:
@@ -261,17 +440,10 @@ def calculate_hash_wrapper(params: HashCalculationInput) -> str:
 def compare_hash_wrapper(params: HashComparisonInput) -> str:
     '''Calculate hash of input data and compare with expected hash.'''
     try:
-        # Get input data
-        data = get_input_data(params.input_type, params.input_data)
+        calculated_hash, input_size, normalized_size = _hash_params(params)
         
-        # Apply normalization if requested
-        normalized_data = normalize_data(data, params.normalization)
-        
-        # Calculate hash
-        calculated_hash = calculate_hash(normalized_data, params.algorithm)
-        
-        # Compare with expected hash
-        match = calculated_hash.lower() == params.expected_hash.lower()
+        # Compare raw digest bytes in constant time; fromhex also ignores hex case
+        match = hmac.compare_digest(bytes.fromhex(calculated_hash), bytes.fromhex(params.expected_hash))
         
         # Prepare details
         details = {
@@ -281,13 +453,13 @@ def compare_hash_wrapper(params: HashComparisonInput) -> str:
             "calculated_hash": calculated_hash,
             "expected_hash": params.expected_hash,
             "match": match,
-            "input_size_bytes": len(data),
-            "normalized_size_bytes": len(normalized_data) if params.normalization != NormalizationType.NONE else len(data)
+            "input_size_bytes": input_size,
+            "normalized_size_bytes": normalized_size
         }
         
         if params.input_type == InputType.FILE:
             details["file_path"] = params.input_data
-            details["file_size"] = os.path.getsize(params.input_data)
+            details["file_size"] = get_params_stat(params).st_size
         
         # Prepare result
         result = {
@@ -310,6 +482,9 @@ def compare_hash_wrapper(params: HashComparisonInput) -> str:
     except Exception as e:
         return f"Error: {str(e)}"
 
+# Batches with at least this many files are hashed on a thread pool
+PARALLEL_MIN_FILES = 4
+
 # Batch hash calculation function
 def batch_hash_calculation(
     algorithm: HashAlgorithm,
@@ -320,57 +495,58 @@ def batch_hash_calculation(
 ) -> str:
     '''Calculate hashes for multiple inputs.'''
     try:
-        results = []
-        details_list = []
+        def hash_one(input_data: str):
+            return _hash_source(algorithm, input_type, input_data, normalization)
         
-        for input_data in input_list:
-            # Get input data
-            data = get_input_data(input_type, input_data)
-            
-            # Apply normalization if requested
-            normalized_data = normalize_data(data, normalization)
-            
-            # Calculate hash
-            hash_value = calculate_hash(normalized_data, algorithm)
-            
-            # Prepare result entry
-            result_entry = {
-                "input": input_data,
-                "hash": hash_value
-            }
-            
-            if input_type == InputType.FILE:
-                result_entry["file_size"] = os.path.getsize(input_data)
-            
-            results.append(result_entry)
-            
-            # Prepare details entry
-            details_entry = {
-                "input": input_data,
-                "algorithm": algorithm.value,
-                "normalization": normalization.value,
-                "input_size_bytes": len(data),
-                "normalized_size_bytes": len(normalized_data) if normalization != NormalizationType.NONE else len(data)
-            }
-            
-            if input_type == InputType.FILE:
-                details_entry["file_path"] = input_data
-                details_entry["file_size"] = os.path.getsize(input_data)
-            
-            details_list.append(details_entry)
+        # hashlib releases the GIL while hashing, so file batches scale across
+        # threads; CRCs are cheap enough that pool overhead would dominate
+        if (input_type == InputType.FILE
+                and algorithm not in (HashAlgorithm.CRC32, HashAlgorithm.CRC32C)
+                and len(input_list) >= PARALLEL_MIN_FILES):
+            with ThreadPoolExecutor(max_workers=min(len(input_list), os.cpu_count() or 1)) as executor:
+                hashed = list(executor.map(hash_one, input_list))
+        else:
+            hashed = [hash_one(input_data) for input_data in input_list]
         
-        # Prepare overall details
+        hashes = [h[0] for h in hashed]
+        input_sizes = [h[1] for h in hashed]
+        normalized_sizes = [h[2] for h in hashed]
+        
+        # Prepare result entries; a file's size is its input size, so no extra stat
+        if input_type == InputType.FILE:
+            results = [
+                {"input": input_data, "hash": hash_value, "file_size": size}
+                for input_data, hash_value, size in zip(input_list, hashes, input_sizes)
+            ]
+        else:
+            results = [
+                {"input": input_data, "hash": hash_value}
+                for input_data, hash_value in zip(input_list, hashes)
+            ]
+        
+        # Shared settings are stored once; per-input sizes are parallel lists
         overall_details = {
             "algorithm": algorithm.value,
             "input_type": input_type.value,
             "normalization": normalization.value,
             "total_inputs": len(input_list),
-            "inputs": details_list
+            "inputs": list(input_list),
+            "input_sizes": input_sizes,
+            "normalized_sizes": normalized_sizes
         }
         
         # Format response
         if response_format == ResponseFormat.MARKDOWN:
-            return _format_result_markdown(f"Batch Hash Calculation: {algorithm.value}", results, overall_details)
+            # Render one line per input by zipping the parallel lists
+            display_details = {
+                key: overall_details[key]
+                for key in ("algorithm", "input_type", "normalization", "total_inputs")
+            }
+            display_details["inputs"] = [
+                f"{input_data}: {input_size} bytes (normalized: {normalized_size} bytes)"
+                for input_data, input_size, normalized_size in zip(input_list, input_sizes, normalized_sizes)
+            ]
+            return _format_result_markdown(f"Batch Hash Calculation: {algorithm.value}", results, display_details)
         else:
             return _format_result_json(f"Batch Hash Calculation: {algorithm.value}", results, overall_details)
             
@@ -3,26 +3,23 @@
 Setup script for Calculator MCP Server
 '''
 
+import asyncio
+import importlib
+import importlib.util
 import subprocess
 import sys
 import os
 
+PIP_INSTALL = [sys.executable, "-m", "pip", "install", "--disable-pip-version-check"]
+
 def install_dependencies():
     '''Install required Python packages.'''
     print("Installing dependencies...")
     
-    # Check if pip is available
-    try:
-        subprocess.run([sys.executable, "-m", "pip", "--version"], 
-                      check=True, capture_output=True)
-    except subprocess.CalledProcessError:
-        print("Error: pip not found. Please install pip first.")
-        return False
-    
-    # Install from requirements.txt
+    # Install from requirements.txt (a missing pip surfaces as an install error)
     if os.path.exists("requirements.txt"):
         try:
-            subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
+            subprocess.run(PIP_INSTALL + ["-r", "requirements.txt"],
                           check=True)
             print("Dependencies installed successfully!")
             return True
@@ -33,7 +30,7 @@ def install_dependencies():
         print("requirements.txt not found. Installing default packages...")
         try:
             packages = ["mcp[fastmcp]", "pydantic", "httpx"]
-            subprocess.run([sys.executable, "-m", "pip", "install"] + packages,
+            subprocess.run(PIP_INSTALL + packages,
                           check=True)
             print("Default packages installed successfully!")
             return True
@@ -49,10 +46,10 @@ def verify_installation():
     missing_packages = []
     
     for package in required_packages:
-        try:
-            __import__(package.replace("-", "_"))
+        # find_spec only locates the package; it does not execute its code
+        if importlib.util.find_spec(package.replace("-", "_")) is not None:
             print(f"✓ {package}")
-        except ImportError:
+        else:
             missing_packages.append(package)
             print(f"✗ {package} (missing)")
     
@@ -70,11 +67,16 @@ def run_tests():
     print("\nRunning tests...")
     
     if os.path.exists("test_calculator.py"):
+        # Run in this interpreter instead of spawning another one; packages
+        # installed earlier in this run are picked up after invalidate_caches()
         try:
-            subprocess.run([sys.executable, "test_calculator.py"], check=True)
+            importlib.invalidate_caches()
+            sys.path.insert(0, os.getcwd())
+            import test_calculator
+            asyncio.run(test_calculator.main())
             print("\nTests completed successfully!")
             return True
-        except subprocess.CalledProcessError as e:
+        except Exception as e:
             print(f"\nTests failed: {e}")
             return False
     else:
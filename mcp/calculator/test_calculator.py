@@ -34,10 +34,16 @@ from calculator_mcp import (
     LengthUnit,
     WeightUnit
 )
+from fast_math import basic_op, quick_result, BASIC_OP_CODES
+
+def truncate(s: str, n: int = 200) -> str:
+    '''Shorten long tool output for display.'''
+    return s if len(s) <= n else s[:n] + "..."
 
 async def test_basic_operations():
     '''Test basic arithmetic operations.'''
-    print("=== Testing Basic Operations ===")
+    out = []
+    out.append("=== Testing Basic Operations ===")
     
     # Test addition
     params = BasicOperationInput(
@@ -47,9 +53,9 @@ async def test_basic_operations():
         response_format=ResponseFormat.MARKDOWN
     )
     result = await calculator_basic_operation(params)
-    print("Addition (5 + 3):")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("Addition (5 + 3):")
+    out.append(truncate(result))
+    out.append("")
     
     # Test division
     params = BasicOperationInput(
@@ -59,13 +65,18 @@ async def test_basic_operations():
         response_format=ResponseFormat.JSON
     )
     result = await calculator_basic_operation(params)
-    print("Division (15 / 3) JSON:")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    # Check the tool's number against the local compiled fast path
+    expected = basic_op(BASIC_OP_CODES[params.operation.value], params.a, params.b)
+    assert quick_result(result) == expected, f"Division mismatch: {result}"
+    out.append("Division (15 / 3) JSON:")
+    out.append(truncate(result))
+    out.append("")
+    return "\n".join(out)
 
 async def test_advanced_math():
     '''Test advanced mathematical operations.'''
-    print("=== Testing Advanced Math ===")
+    out = []
+    out.append("=== Testing Advanced Math ===")
     
     # Test square root
     params = AdvancedMathInput(
@@ -74,9 +85,9 @@ async def test_advanced_math():
         response_format=ResponseFormat.MARKDOWN
     )
     result = await calculator_advanced_math(params)
-    print("Square root of 16:")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("Square root of 16:")
+    out.append(truncate(result))
+    out.append("")
     
     # Test power
     params = AdvancedMathInput(
@@ -86,13 +97,15 @@ async def test_advanced_math():
         response_format=ResponseFormat.JSON
     )
     result = await calculator_advanced_math(params)
-    print("2^3 JSON:")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("2^3 JSON:")
+    out.append(truncate(result))
+    out.append("")
+    return "\n".join(out)
 
 async def test_trigonometric():
     '''Test trigonometric operations.'''
-    print("=== Testing Trigonometric Functions ===")
+    out = []
+    out.append("=== Testing Trigonometric Functions ===")
     
     # Test sine
     params = TrigonometricInput(
@@ -102,9 +115,9 @@ async def test_trigonometric():
         response_format=ResponseFormat.MARKDOWN
     )
     result = await calculator_trigonometric(params)
-    print("Sine of 30 degrees:")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("Sine of 30 degrees:")
+    out.append(truncate(result))
+    out.append("")
     
     # Test arcsine
     params = TrigonometricInput(
@@ -114,13 +127,15 @@ async def test_trigonometric():
         response_format=ResponseFormat.JSON
     )
     result = await calculator_trigonometric(params)
-    print("Arcsine of 0.5 (degrees) JSON:")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("Arcsine of 0.5 (degrees) JSON:")
+    out.append(truncate(result))
+    out.append("")
+    return "\n".join(out)
 
 async def test_statistics():
     '''Test statistical calculations.'''
-    print("=== Testing Statistics ===")
+    out = []
+    out.append("=== Testing Statistics ===")
     
     # Test mean
     params = StatisticsInput(
@@ -129,9 +144,9 @@ async def test_statistics():
         response_format=ResponseFormat.MARKDOWN
     )
     result = await calculator_statistics(params)
-    print("Mean of [1, 2, 3, 4, 5]:")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("Mean of [1, 2, 3, 4, 5]:")
+    out.append(truncate(result))
+    out.append("")
     
     # Test standard deviation
     params = StatisticsInput(
@@ -140,13 +155,15 @@ async def test_statistics():
         response_format=ResponseFormat.JSON
     )
     result = await calculator_statistics(params)
-    print("Standard deviation JSON:")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("Standard deviation JSON:")
+    out.append(truncate(result))
+    out.append("")
+    return "\n".join(out)
 
 async def test_unit_conversion():
     '''Test unit conversions.'''
-    print("=== Testing Unit Conversions ===")
+    out = []
+    out.append("=== Testing Unit Conversions ===")
     
     # Test temperature conversion
     params = UnitConversionInput(
@@ -157,9 +174,9 @@ async def test_unit_conversion():
         response_format=ResponseFormat.MARKDOWN
     )
     result = await calculator_unit_conversion(params)
-    print("100°C to Fahrenheit:")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("100°C to Fahrenheit:")
+    out.append(truncate(result))
+    out.append("")
     
     # Test length conversion
     params = UnitConversionInput(
@@ -170,13 +187,15 @@ async def test_unit_conversion():
         response_format=ResponseFormat.JSON
     )
     result = await calculator_unit_conversion(params)
-    print("1 meter to inches JSON:")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("1 meter to inches JSON:")
+    out.append(truncate(result))
+    out.append("")
+    return "\n".join(out)
 
 async def test_hash_calculation():
     '''Test hash calculations.'''
-    print("=== Testing Hash Calculations ===")
+    out = []
+    out.append("=== Testing Hash Calculations ===")
     
     # Test SHA256 of text
     params = HashCalculationInput(
@@ -187,9 +206,9 @@ async def test_hash_calculation():
         response_format=ResponseFormat.MARKDOWN
     )
     result = await calculator_hash_calculation(params)
-    print("SHA256 of 'Hello, World!':")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("SHA256 of 'Hello, World!':")
+    out.append(truncate(result))
+    out.append("")
     
     # Test MD5 with JSON normalization
     params = HashCalculationInput(
@@ -200,13 +219,15 @@ async def test_hash_calculation():
         response_format=ResponseFormat.JSON
     )
     result = await calculator_hash_calculation(params)
-    print("MD5 of normalized JSON:")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("MD5 of normalized JSON:")
+    out.append(truncate(result))
+    out.append("")
+    return "\n".join(out)
 
 async def test_hash_comparison():
     '''Test hash comparisons.'''
-    print("=== Testing Hash Comparisons ===")
+    out = []
+    out.append("=== Testing Hash Comparisons ===")
     
     # Test matching hash
     params = HashComparisonInput(
@@ -218,9 +239,9 @@ async def test_hash_comparison():
         response_format=ResponseFormat.MARKDOWN
     )
     result = await calculator_hash_comparison(params)
-    print("Hash comparison (should match):")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("Hash comparison (should match):")
+    out.append(truncate(result))
+    out.append("")
     
     # Test mismatching hash
     params = HashComparisonInput(
@@ -232,21 +253,28 @@ async def test_hash_comparison():
         response_format=ResponseFormat.JSON
     )
     result = await calculator_hash_comparison(params)
-    print("Hash comparison (should mismatch) JSON:")
-    print(result[:200] + "..." if len(result) > 200 else result)
-    print()
+    out.append("Hash comparison (should mismatch) JSON:")
+    out.append(truncate(result))
+    out.append("")
+    return "\n".join(out)
 
 async def main():
     '''Run all tests.'''
     print("Starting Calculator MCP Server Tests...\n")
     
-    await test_basic_operations()
-    await test_advanced_math()
-    await test_trigonometric()
-    await test_statistics()
-    await test_unit_conversion()
-    await test_hash_calculation()
-    await test_hash_comparison()
+    # The tests are independent, so run them together; each returns its
+    # output so it can be printed in a stable order afterwards
+    outputs = await asyncio.gather(
+        test_basic_operations(),
+        test_advanced_math(),
+        test_trigonometric(),
+        test_statistics(),
+        test_unit_conversion(),
+        test_hash_calculation(),
+        test_hash_comparison()
+    )
+    for output in outputs:
+        print(output)
     
     print("All tests completed!")
 
@@ -10,9 +10,38 @@ import subprocess
 import json
 from pathlib import Path
 
+# 技能目录索引：相对路径 -> os.DirEntry，由 build_index 一次遍历生成
+_INDEX = {}
+
+def build_index(root="."):
+    """用 os.scandir 遍历一次目录树，建立相对路径（以 / 分隔）到 DirEntry 的索引
+
+    与 Path.exists() 一致，目录符号链接也会被跟随；只有指向自身祖先目录（成环）的链接不再深入
+    """
+    index = {}
+    root_stat = os.stat(root)
+    # 每个待遍历目录带上其祖先目录的 (st_dev, st_ino) 集合
+    stack = [(root, "", frozenset({(root_stat.st_dev, root_stat.st_ino)}))]
+    while stack:
+        path, rel, ancestors = stack.pop()
+        with os.scandir(path) as it:
+            for entry in it:
+                key = f"{rel}{entry.name}"
+                index[key] = entry
+                if entry.is_dir():
+                    st = entry.stat()
+                    ident = (st.st_dev, st.st_ino)
+                    if ident not in ancestors:
+                        stack.append((entry.path, f"{key}/", ancestors | {ident}))
+    return index
+
+def _index_key(filepath):
+    """索引键统一用 / 分隔（Windows 上 str(Path) 使用反斜杠）"""
+    return Path(filepath).as_posix()
+
 def check_file_exists(filepath, description):
     """检查文件是否存在"""
-    if os.path.exists(filepath):
+    if _index_key(filepath) in _INDEX:
         print(f"✓ {description}: {filepath}")
         return True
     else:
@@ -22,7 +51,8 @@ def check_file_exists(filepath, description):
 def check_file_content(filepath, min_size=100):
     """检查文件内容是否完整"""
     try:
-        size = os.path.getsize(filepath)
+        entry = _INDEX.get(_index_key(filepath))
+        size = entry.stat().st_size if entry is not None else os.path.getsize(filepath)
         if size >= min_size:
             print(f"  ✓ 文件大小: {size} 字节")
             return True
@@ -143,14 +173,15 @@ def check_directory_structure():
     for item in expected_structure:
         if item.endswith('/'):
             # 检查目录
-            if os.path.isdir(item.rstrip('/')):
+            entry = _INDEX.get(item.rstrip('/'))
+            if entry is not None and entry.is_dir():
                 print(f"✓ 目录存在: {item}")
             else:
                 print(f"✗ 目录不存在: {item}")
                 all_ok = False
         else:
             # 检查文件
-            if os.path.exists(item):
+            if item in _INDEX:
                 print(f"✓ 文件存在: {item}")
             else:
                 print(f"✗ 文件不存在: {item}")
@@ -163,7 +194,7 @@ def run_test_script():
     print("\n5. 运行测试脚本...")
     test_script = Path("scripts/test_clawhub.sh")
     
-    if not test_script.exists():
+    if _index_key(test_script) not in _INDEX:
         print("✗ 测试脚本不存在")
         return False
     
@@ -208,6 +239,9 @@ def main():
     os.chdir(skill_dir)
     print(f"工作目录: {os.getcwd()}")
     
+    # 一次遍历建立索引，后续存在性检查都是字典查找
+    _INDEX.update(build_index())
+    
     # 执行各项检查
     checks = [
         ("目录结构", check_directory_structure),
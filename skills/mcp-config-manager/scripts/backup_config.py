@@ -8,6 +8,7 @@ import json
 import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -39,22 +40,40 @@ def backup_config_files(backup_dir="backup"):
     # 备份的文件列表
     files_to_backup = ["config.json", "mcp.json"]
     
+    # 每个文件只stat一次，不存在的文件直接跳过
+    sources = []
     for filename in files_to_backup:
-        source_file = current_dir / filename
-        
-        if source_file.exists():
-            # 创建备份文件名
-            backup_filename = f"{filename}.backup.{timestamp}"
-            backup_file = backup_path / backup_filename
-            
-            # 复制文件
-            shutil.copy2(source_file, backup_file)
+        try:
+            st = (current_dir / filename).stat()
+        except FileNotFoundError:
+            st = None
+        sources.append((filename, st))
+    
+    def copy_one(filename):
+        backup_filename = f"{filename}.backup.{timestamp}"
+        # 复制内容（Linux上走sendfile/copy_file_range）和权限位：配置中含有密钥，
+        # 备份不能比原文件更宽松；时间戳不保留，备份时间已编码在文件名中
+        shutil.copyfile(current_dir / filename, backup_path / backup_filename)
+        shutil.copymode(current_dir / filename, backup_path / backup_filename)
+        return backup_filename
+    
+    # 并行复制文件
+    to_copy = [filename for filename, st in sources if st is not None]
+    copied = {}
+    if to_copy:
+        workers = min(len(to_copy), (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            copied = dict(zip(to_copy, pool.map(copy_one, to_copy)))
+    
+    for filename, st in sources:
+        if st is not None:
+            backup_filename = copied[filename]
             
             # 记录备份信息
             file_info = {
                 "original": filename,
                 "backup": backup_filename,
-                "size": os.path.getsize(source_file)
+                "size": st.st_size
             }
             backup_info["files"].append(file_info)
             
@@ -62,7 +81,7 @@ def backup_config_files(backup_dir="backup"):
         else:
             print(f"⚠ 文件 {filename} 不存在，跳过备份")
     
-    # 保存备份信息
+    # 保存备份信息（一次写入）
     info_file = backup_path / f"backup_info.{timestamp}.json"
     with open(info_file, 'w', encoding='utf-8') as f:
         json.dump(backup_info, f, indent=2, ensure_ascii=False)
@@ -4,32 +4,47 @@
 提供详细的MCP服务器和配置信息
 """
 
+import functools
 import json
+import os
+import re
+import shutil
+import sys
 from pathlib import Path
 
 def load_json_file(filename):
-    """加载JSON文件"""
-    file_path = Path(filename)
-    
-    if not file_path.exists():
+    """加载JSON文件（解析结果按文件名和修改时间缓存，只读使用）"""
+    # 直接stat，不存在时捕获异常，省去单独的exists检查
+    try:
+        mtime_ns = Path(filename).stat().st_mtime_ns
+    except FileNotFoundError:
         print(f"⚠ 文件 {filename} 不存在")
         return None
     
+    # 修改时间作为缓存键的一部分，文件被编辑后会重新解析
+    return _load_json_cached(filename, mtime_ns)
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(filename, mtime_ns):
+    file_path = Path(filename)
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return json.loads(file_path.read_bytes())
     except Exception as e:
         print(f"读取 {filename} 时出错: {e}")
         return None
 
+# 敏感值不超过这个长度时整体隐藏，更长的保留前8位和后4位
+_MASK_ALL_MAX_LEN = 12
+
 def mask_secret(value: str) -> str:
     """隐藏敏感信息的部分内容"""
-    if not value:
-        return ""
-    if len(value) <= 12:
+    if len(value) <= _MASK_ALL_MAX_LEN:
         return "***"
     return value[:8] + "..." + value[-4:]
 
+# show_config_info 单独展示的顶层键
+_SHOWN_CONFIG_KEYS = frozenset({"model_config", "web_search", "api_key", "base_url", "model", "max_tokens", "tavily_api_key"})
+
 def show_config_info():
     """显示config.json信息"""
     config = load_json_file("config.json")
@@ -54,7 +69,7 @@ def show_config_info():
         for key in legacy_keys:
             if key not in config:
                 continue
-            value = config.get(key)
+            value = config[key]
             if key == "api_key" and isinstance(value, str) and value:
                 print(f"  {key}: {mask_secret(value)}")
             else:
@@ -73,12 +88,12 @@ def show_config_info():
         if isinstance(value, str) and value:
             print(f"  tavily_api_key: {mask_secret(value)}")
 
-    ignored = {"model_config", "web_search", "api_key", "base_url", "model", "max_tokens", "tavily_api_key"}
-    other_keys = sorted([k for k in config.keys() if k not in ignored])
+    # 其余顶层键只显示摘要，不展开嵌套内容
+    other_keys = sorted(config.keys() - _SHOWN_CONFIG_KEYS)
     if other_keys:
         print("  other:")
         for k in other_keys:
-            v = config.get(k)
+            v = config[k]
             if isinstance(v, dict):
                 print(f"    {k}: object ({len(v)} keys)")
             elif isinstance(v, list):
@@ -88,6 +103,28 @@ def show_config_info():
     
     print()
 
+def _format_server(i, server):
+    """格式化单个MCP服务器的信息块（以空行结尾）"""
+    name = server.get("name", "未命名")
+    transport = server.get("transport", "未知")
+    command = server.get("command", "")
+    
+    parts = [
+        f"  {i}. {name}",
+        f"     传输方式: {transport}",
+        f"     命令: {command}"
+    ]
+    
+    if "args" in server and server["args"]:
+        parts.append(f"     参数: {server['args']}")
+    
+    if "env" in server and server["env"]:
+        parts.append("     环境变量:")
+        parts.extend(f"       {env_key}={env_value}" for env_key, env_value in server["env"].items())
+    
+    parts.append("")
+    return "\n".join(parts) + "\n"
+
 def show_mcp_info():
     """显示mcp.json信息"""
     config = load_json_file("mcp.json")
@@ -106,24 +143,8 @@ def show_mcp_info():
     
     print(f"  共配置了 {len(servers)} 个MCP服务器:\n")
     
-    for i, server in enumerate(servers, 1):
-        name = server.get("name", "未命名")
-        transport = server.get("transport", "未知")
-        command = server.get("command", "")
-        
-        print(f"  {i}. {name}")
-        print(f"     传输方式: {transport}")
-        print(f"     命令: {command}")
-        
-        if "args" in server and server["args"]:
-            print(f"     参数: {server['args']}")
-        
-        if "env" in server and server["env"]:
-            print(f"     环境变量:")
-            for env_key, env_value in server["env"].items():
-                print(f"       {env_key}={env_value}")
-        
-        print()
+    # 整块拼好后一次写出
+    sys.stdout.write("".join(_format_server(i, server) for i, server in enumerate(servers, 1)))
 
 def show_example_mcp_info():
     """显示示例mcp配置信息"""
@@ -143,30 +164,14 @@ def show_example_mcp_info():
     
     print(f"  示例中共有 {len(servers)} 个MCP服务器:\n")
     
-    for i, server in enumerate(servers, 1):
-        name = server.get("name", "未命名")
-        transport = server.get("transport", "未知")
-        command = server.get("command", "")
-        
-        print(f"  {i}. {name}")
-        print(f"     传输方式: {transport}")
-        print(f"     命令: {command}")
-        
-        if "args" in server and server["args"]:
-            print(f"     参数: {server['args']}")
-        
-        if "env" in server and server["env"]:
-            print(f"     环境变量:")
-            for env_key, env_value in server["env"].items():
-                print(f"       {env_key}={env_value}")
-        
-        print()
+    # 整块拼好后一次写出
+    sys.stdout.write("".join(_format_server(i, server) for i, server in enumerate(servers, 1)))
+
+# 命令字符串中的可执行文件部分（第一个非空白片段）
+_CMD_HEAD = re.compile(r"\S+")
 
 def check_mcp_status():
     """检查MCP服务器状态"""
-    import subprocess
-    import shutil
-    
     print("🔍 MCP服务器状态检查:")
     print("=" * 50)
     
@@ -186,10 +191,11 @@ def check_mcp_status():
         # 检查命令是否存在
         if command:
             # 提取可执行文件路径
-            cmd_path = command.split()[0] if ' ' in command else command
+            m = _CMD_HEAD.search(command)
+            cmd_path = m.group(0) if m else ""
             
             # 检查文件是否存在
-            if Path(cmd_path).exists():
+            if os.path.exists(cmd_path):
                 print(f"     命令文件: ✅ 存在 ({cmd_path})")
             else:
                 # 检查是否在PATH中
@@ -203,32 +209,24 @@ def check_mcp_status():
         
         print()
 
+# 子命令 -> 处理函数；"all" 按顺序执行全部
+HANDLERS = {
+    "config": show_config_info,
+    "mcp": show_mcp_info,
+    "example": show_example_mcp_info,
+    "status": check_mcp_status
+}
+
 if __name__ == "__main__":
-    import sys
-    
     # 解析命令行参数
-    show_all = True
-    if len(sys.argv) > 1:
-        show_all = False
-        command = sys.argv[1]
-        
-        if command == "config":
-            show_config_info()
-        elif command == "mcp":
-            show_mcp_info()
-        elif command == "example":
-            show_example_mcp_info()
-        elif command == "status":
-            check_mcp_status()
-        elif command == "all":
-            show_all = True
-        else:
-            print(f"未知命令: {command}")
-            print("可用命令: config, mcp, example, status, all")
-            sys.exit(1)
-    
-    if show_all:
-        show_config_info()
-        show_mcp_info()
-        show_example_mcp_info()
-        check_mcp_status()
+    command = sys.argv[1] if len(sys.argv) > 1 else "all"
+    
+    if command == "all":
+        for handler in HANDLERS.values():
+            handler()
+    elif command in HANDLERS:
+        HANDLERS[command]()
+    else:
+        print(f"未知命令: {command}")
+        print("可用命令: config, mcp, example, status, all")
+        sys.exit(1)
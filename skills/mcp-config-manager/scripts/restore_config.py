@@ -5,11 +5,27 @@
 """
 
 import json
+import os
 import shutil
 import sys
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+# 备份信息文件达到这个数量时用线程池并行读取
+PARALLEL_MIN_FILES = 4
+
+def _load_backup_info(file):
+    """读取一个备份信息文件，返回 (info, error)"""
+    try:
+        with open(file, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        info["info_file"] = str(file)
+        return info, None
+    except Exception as e:
+        return None, e
+
 def list_backups(backup_dir="backup"):
     """
     列出所有备份文件
@@ -26,20 +42,33 @@ def list_backups(backup_dir="backup"):
         print(f"备份目录 {backup_dir} 不存在")
         return []
     
-    backups = []
+    # (时间戳, 备份信息)：排序键在读取时取一次
+    keyed = []
+    
+    # 查找备份信息文件（backup_info.*.json）；DirEntry 自带类型信息，省去额外的stat
+    with os.scandir(backup_path) as it:
+        files = [
+            entry.path for entry in it
+            if entry.name.startswith("backup_info.") and entry.name.endswith(".json")
+            and len(entry.name) >= len("backup_info..json") and entry.is_file()
+        ]
+    
+    # 文件较多时并行读取；错误信息仍按文件顺序输出
+    if len(files) >= PARALLEL_MIN_FILES:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            loaded = list(pool.map(_load_backup_info, files))
+    else:
+        loaded = [_load_backup_info(file) for file in files]
     
-    # 查找备份信息文件
-    for file in backup_path.glob("backup_info.*.json"):
-        try:
-            with open(file, 'r', encoding='utf-8') as f:
-                info = json.load(f)
-                info["info_file"] = str(file)
-                backups.append(info)
-        except Exception as e:
-            print(f"读取备份信息文件 {file} 时出错: {e}")
+    for file, (info, error) in zip(files, loaded):
+        if error is not None:
+            print(f"读取备份信息文件 {file} 时出错: {error}")
+        else:
+            keyed.append((info.get("timestamp", ""), info))
     
     # 按时间戳排序（最新的在前）
-    backups.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+    keyed.sort(key=itemgetter(0), reverse=True)
+    backups = [info for _, info in keyed]
     
     return backups
 
@@ -69,6 +98,35 @@ def show_backup_list(backups):
         
         print()
 
+def _restore_file(source_file, target_file):
+    """
+    用备份覆盖目标文件，目标已存在时先为其另存一份
+    
+    备份先复制到目标旁的临时文件：备份文件不存在时 copyfile 直接抛出
+    FileNotFoundError，当前文件不会被改动，也不会产生多余的 before_restore 文件。
+    
+    Returns:
+        Path | None: 当前文件的备份路径（目标原本不存在时为 None）
+    """
+    tmp_file = target_file.with_name(f"{target_file.name}.restore_tmp")
+    # copyfile 走内核零拷贝路径，再同步权限和时间戳
+    shutil.copyfile(source_file, tmp_file)
+    try:
+        shutil.copystat(source_file, tmp_file)
+        
+        # 备份当前文件（如果存在）
+        current_backup = None
+        if target_file.exists():
+            current_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            current_backup = target_file.parent / f"{target_file.name}.before_restore.{current_timestamp}"
+            shutil.copy2(target_file, current_backup)
+        
+        os.replace(tmp_file, target_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    return current_backup
+
 def restore_from_backup(backup_index, backup_dir="backup", confirm=True):
     """
     从指定备份恢复文件
@@ -95,6 +153,7 @@ def restore_from_backup(backup_index, backup_dir="backup", confirm=True):
     timestamp = backup.get("timestamp", "未知时间")
     backup_path = Path(backup.get("backup_dir", backup_dir))
     files = backup.get("files", [])
+    cwd = Path.cwd()
     
     print(f"准备从备份恢复 (时间: {timestamp}):")
     print("=" * 50)
@@ -105,7 +164,7 @@ def restore_from_backup(backup_index, backup_dir="backup", confirm=True):
         backup_file = file_info.get("backup", "未知备份")
         
         source_file = backup_path / backup_file
-        target_file = Path.cwd() / original
+        target_file = cwd / original
         
         print(f"  {original}")
         print(f"    ← {backup_file}")
@@ -132,25 +191,20 @@ def restore_from_backup(backup_index, backup_dir="backup", confirm=True):
         backup_file = file_info.get("backup", "未知备份")
         
         source_file = backup_path / backup_file
-        target_file = Path.cwd() / original
-        
-        if not source_file.exists():
-            print(f"⚠ 备份文件 {backup_file} 不存在，跳过")
-            continue
+        target_file = cwd / original
         
         try:
-            # 备份当前文件（如果存在）
-            if target_file.exists():
-                current_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                current_backup = target_file.parent / f"{original}.before_restore.{current_timestamp}"
-                shutil.copy2(target_file, current_backup)
+            current_backup = _restore_file(source_file, target_file)
+            if current_backup is not None:
                 print(f"  ✓ 已备份当前 {original} -> {current_backup.name}")
-            
-            # 恢复文件
-            shutil.copy2(source_file, target_file)
             restored_files.append(original)
             print(f"  ✅ 已恢复 {original}")
             
+        except FileNotFoundError as e:
+            if e.filename != str(source_file):
+                print(f"  ❌ 恢复 {original} 时出错: {e}")
+                continue
+            print(f"⚠ 备份文件 {backup_file} 不存在，跳过")
         except Exception as e:
             print(f"  ❌ 恢复 {original} 时出错: {e}")
     
@@ -213,6 +267,7 @@ def restore_specific_file(filename, backup_dir="backup", timestamp=None):
     source_file = backup_path / backup_file
     target_file = Path.cwd() / filename
     
+    # 在询问确认之前检查，避免确认后才提示备份不存在
     if not source_file.exists():
         print(f"备份文件 {backup_file} 不存在")
         return False
@@ -228,18 +283,18 @@ def restore_specific_file(filename, backup_dir="backup", timestamp=None):
         return False
     
     try:
-        # 备份当前文件（如果存在）
-        if target_file.exists():
-            current_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            current_backup = target_file.parent / f"{filename}.before_restore.{current_timestamp}"
-            shutil.copy2(target_file, current_backup)
+        current_backup = _restore_file(source_file, target_file)
+        if current_backup is not None:
             print(f"✓ 已备份当前 {filename} -> {current_backup.name}")
-        
-        # 恢复文件
-        shutil.copy2(source_file, target_file)
         print(f"✅ 已恢复 {filename}")
         return True
         
+    except FileNotFoundError as e:
+        if e.filename == str(source_file):
+            print(f"备份文件 {backup_file} 不存在")
+        else:
+            print(f"❌ 恢复 {filename} 时出错: {e}")
+        return False
     except Exception as e:
         print(f"❌ 恢复 {filename} 时出错: {e}")
         return False
@@ -4,40 +4,73 @@
 支持通过名称启用或禁用特定的MCP服务器
 """
 
+import contextlib
 import json
+import os
+import shutil
 import sys
 from pathlib import Path
 
+try:
+    # 可选：更快的JSON序列化
+    import orjson
+except ImportError:
+    orjson = None
+
+def build_name_index(servers):
+    """建立 名称 -> 服务器下标列表 的索引（同名服务器按出现顺序）"""
+    index = {}
+    for i, server in enumerate(servers):
+        index.setdefault(server.get("name"), []).append(i)
+    return index
+
 def load_mcp_config():
-    """加载mcp.json配置文件"""
+    """加载mcp.json配置文件，返回 (配置, 名称索引)"""
     config_file = Path("mcp.json")
     
-    if not config_file.exists():
-        print(f"错误: 找不到 {config_file}")
-        return None
-    
+    # 直接打开，不存在时捕获异常，省去单独的exists检查
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        config = json.loads(config_file.read_bytes())
+        return config, build_name_index(config.get("mcp_servers", []))
+    except FileNotFoundError:
+        print(f"错误: 找不到 {config_file}")
+        return None, None
     except Exception as e:
         print(f"读取 {config_file} 时出错: {e}")
-        return None
+        return None, None
 
 def save_mcp_config(config):
     """保存mcp.json配置文件"""
     config_file = Path("mcp.json")
+    tmp_file = config_file.with_suffix(".json.tmp")
     
     try:
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        data = json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8')
+        
+        # 先写临时文件再原子替换，写入中途失败不会留下损坏的配置
+        with open(tmp_file, "wb") as f:
+            # env 中可能有密钥：写入内容之前沿用原文件的权限位
+            try:
+                shutil.copymode(config_file, tmp_file)
+            except FileNotFoundError:
+                pass
+            f.write(data)
+            f.flush()
+            # 落盘后再替换，崩溃时不会出现指向空文件的 mcp.json
+            os.fsync(f.fileno())
+        os.replace(tmp_file, config_file)
         return True
     except Exception as e:
         print(f"保存 {config_file} 时出错: {e}")
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
         return False
 
 def list_mcp_servers():
     """列出所有MCP服务器"""
-    config = load_mcp_config()
+    config, _ = load_mcp_config()
     
     if not config:
         return []
@@ -64,96 +97,163 @@ def list_mcp_servers():
     
     return servers
 
-def enable_mcp_server(server_name):
-    """启用指定的MCP服务器"""
-    config = load_mcp_config()
+def parse_server_config(text):
+    """解析命令行传入的服务器配置JSON"""
+    # orjson 解析失败时交给标准库重新解析，错误信息与是否安装 orjson 无关
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+class McpSession:
+    """一次加载的mcp.json配置及名称索引，由 mcp_session 负责保存"""
+    __slots__ = ("config", "name_index", "modified", "saved")
     
-    if not config:
-        return False
+    def __init__(self, config, name_index):
+        self.config = config
+        self.name_index = name_index
+        self.modified = False
+        self.saved = False
+
+@contextlib.contextmanager
+def mcp_session():
+    """加载一次mcp.json，退出时（有修改才）保存一次，多个操作共用一次读写"""
+    config, name_index = load_mcp_config()
+    session = McpSession(config, name_index)
+    yield session
     
-    servers = config.get("mcp_servers", [])
+    if session.modified:
+        session.saved = save_mcp_config(config)
+        if session.saved:
+            print(f"✅ 配置已保存到 mcp.json")
+
+def enable_mcp_server(server_name, session=None):
+    """启用指定的MCP服务器；传入 session 时只修改内存中的配置"""
+    if session is None:
+        with mcp_session() as session:
+            enable_mcp_server(server_name, session)
+        return session.saved
+    
+    if not session.config:
+        return False
     
     # 检查服务器是否存在
-    server_found = False
-    for server in servers:
-        if server.get("name") == server_name:
-            server_found = True
-            print(f"✅ MCP服务器 '{server_name}' 已启用")
-            break
-    
-    if not server_found:
+    if server_name not in session.name_index:
         print(f"⚠ 未找到名为 '{server_name}' 的MCP服务器")
         return False
     
-    # 保存配置
-    if save_mcp_config(config):
-        print(f"✅ 配置已保存到 mcp.json")
-        return True
-    else:
-        return False
+    print(f"✅ MCP服务器 '{server_name}' 已启用")
+    session.modified = True
+    return True
 
-def disable_mcp_server(server_name):
-    """禁用指定的MCP服务器（从配置中移除）"""
-    config = load_mcp_config()
+def disable_mcp_server(server_name, session=None):
+    """禁用指定的MCP服务器（从配置中移除）；传入 session 时只修改内存中的配置"""
+    if session is None:
+        with mcp_session() as session:
+            disable_mcp_server(server_name, session)
+        if session.saved:
+            print(f"📊 剩余 {len(session.config['mcp_servers'])} 个MCP服务器")
+        return session.saved
     
-    if not config:
+    if not session.config:
         return False
     
-    servers = config.get("mcp_servers", [])
-    
-    # 查找并移除服务器
-    new_servers = []
-    removed = False
-    
-    for server in servers:
-        if server.get("name") == server_name:
-            removed = True
-            print(f"✅ MCP服务器 '{server_name}' 已从配置中移除")
-        else:
-            new_servers.append(server)
-    
-    if not removed:
+    positions = session.name_index.get(server_name)
+    if not positions:
         print(f"⚠ 未找到名为 '{server_name}' 的MCP服务器")
         return False
     
-    # 更新配置
-    config["mcp_servers"] = new_servers
+    # 按索引移除服务器（从后往前删，前面的下标不变）
+    servers = session.config["mcp_servers"]
+    for i in reversed(positions):
+        del servers[i]
+        print(f"✅ MCP服务器 '{server_name}' 已从配置中移除")
     
-    # 保存配置
-    if save_mcp_config(config):
-        print(f"✅ 配置已保存到 mcp.json")
-        print(f"📊 剩余 {len(new_servers)} 个MCP服务器")
-        return True
-    else:
-        return False
+    # 后面服务器的下标已变化，重建索引
+    session.name_index = build_name_index(servers)
+    session.modified = True
+    return True
 
-def add_mcp_server(server_config):
-    """添加新的MCP服务器"""
-    config = load_mcp_config()
+def add_mcp_server(server_config, session=None):
+    """添加新的MCP服务器；传入 session 时只修改内存中的配置"""
+    if session is None:
+        with mcp_session() as session:
+            add_mcp_server(server_config, session)
+        if session.saved:
+            print(f"📊 当前共有 {len(session.config['mcp_servers'])} 个MCP服务器")
+        return session.saved
     
-    if not config:
+    if not session.config:
         return False
     
-    servers = config.get("mcp_servers", [])
+    if not isinstance(server_config, dict):
+        print("错误: MCP服务器配置必须是JSON对象")
+        return False
+    
+    servers = session.config.get("mcp_servers", [])
     
     # 检查是否已存在同名服务器
     server_name = server_config.get("name")
-    for server in servers:
-        if server.get("name") == server_name:
-            print(f"⚠ 已存在名为 '{server_name}' 的MCP服务器")
-            return False
+    if server_name in session.name_index:
+        print(f"⚠ 已存在名为 '{server_name}' 的MCP服务器")
+        return False
     
     # 添加新服务器
     servers.append(server_config)
-    config["mcp_servers"] = servers
-    
-    # 保存配置
-    if save_mcp_config(config):
-        print(f"✅ 已添加MCP服务器 '{server_name}'")
-        print(f"📊 当前共有 {len(servers)} 个MCP服务器")
-        return True
-    else:
+    session.config["mcp_servers"] = servers
+    session.name_index.setdefault(server_name, []).append(len(servers) - 1)
+    print(f"✅ 已添加MCP服务器 '{server_name}'")
+    session.modified = True
+    return True
+
+# 可以在一次会话中批量执行的操作
+SESSION_COMMANDS = ("enable", "disable", "add")
+
+def run_session(args):
+    """在同一次读写中依次执行多个操作，如: enable A disable B add '{...}'
+
+    参数错误时不执行任何操作；任一操作失败时放弃全部修改、不保存配置并返回 False
+    """
+    if len(args) % 2:
+        print(f"错误: 操作 '{args[-1]}' 缺少参数")
         return False
+    
+    # 先检查全部操作，有错误时不修改配置
+    ops = []
+    for command, arg in zip(args[0::2], args[1::2]):
+        if command not in SESSION_COMMANDS:
+            print(f"错误: 未知命令 '{command}'")
+            return False
+        if command == "add":
+            try:
+                arg = parse_server_config(arg)
+            except json.JSONDecodeError as e:
+                print(f"错误: 无效的JSON格式: {e}")
+                return False
+            if not isinstance(arg, dict):
+                print("错误: MCP服务器配置必须是JSON对象")
+                return False
+        ops.append((command, arg))
+    
+    handlers = {
+        "enable": enable_mcp_server,
+        "disable": disable_mcp_server,
+        "add": add_mcp_server
+    }
+    with mcp_session() as session:
+        for command, arg in ops:
+            if not handlers[command](arg, session):
+                # 已执行的操作只改了内存中的配置，放弃即可
+                session.modified = False
+                if session.config:
+                    print(f"❌ 操作 '{command}' 失败，配置未修改")
+                break
+    
+    if session.saved:
+        print(f"📊 当前共有 {len(session.config['mcp_servers'])} 个MCP服务器")
+    return session.saved
 
 if __name__ == "__main__":
     # 解析命令行参数
@@ -163,11 +263,16 @@ if __name__ == "__main__":
         print("  python toggle_mcp.py enable <server_name>    # 启用MCP服务器")
         print("  python toggle_mcp.py disable <server_name>   # 禁用MCP服务器")
         print("  python toggle_mcp.py add <config_json>       # 添加MCP服务器")
+        print("  python toggle_mcp.py enable A disable B ...  # 一次读写中执行多个操作")
         sys.exit(1)
     
     command = sys.argv[1]
     
-    if command == "list":
+    if len(sys.argv) > 3 and command in SESSION_COMMANDS:
+        if not run_session(sys.argv[1:]):
+            sys.exit(1)
+    
+    elif command == "list":
         list_mcp_servers()
     
     elif command == "enable":
@@ -192,7 +297,7 @@ if __name__ == "__main__":
             sys.exit(1)
         
         try:
-            server_config = json.loads(sys.argv[2])
+            server_config = parse_server_config(sys.argv[2])
             add_mcp_server(server_config)
         except json.JSONDecodeError as e:
             print(f"错误: 无效的JSON格式: {e}")
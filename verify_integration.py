@@ -9,264 +9,455 @@
 4. 依赖项安装
 '''
 
+import errno
+import functools
+import importlib.util
 import os
+import pathlib
 import sys
 import json
-import subprocess
-import stat
+import py_compile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 输出先收集到列表中，在每个检查段落结束时一次性写出
+_out: list[str] = []
+# 线程池任务各自的输出行，由主线程按顺序并入 _out
+_local = threading.local()
+
+def log(msg=""):
+    '''记录一行输出（在线程池任务中记录到该任务自己的缓冲区）'''
+    out = getattr(_local, 'out', None)
+    (_out if out is None else out).append(msg)
+
+def _direct_stdout():
+    '''sys.stdout 就是文件描述符 1 时可以绕过文本流直接 os.write
+
+    sys.stdout 被替换或捕获时（没有 fileno 或不是 1），以及 Windows 下需要
+    文本模式转换换行符时，仍然通过 sys.stdout 输出
+    '''
+    if os.name == 'nt':
+        return False
+    try:
+        return sys.stdout.fileno() == 1
+    except (AttributeError, OSError, ValueError):
+        return False
+
+def flush_log():
+    '''把已收集的输出编码一次，用一次 os.write 写到 stdout（只在主线程中调用）'''
+    if not _out:
+        return
+    text = "\n".join(_out) + "\n"
+    _out.clear()
+    if not _direct_stdout():
+        sys.stdout.write(text)
+        return
+    
+    # 先写出 sys.stdout 中尚未刷新的内容，保证顺序
+    sys.stdout.flush()
+    payload = memoryview(text.encode(sys.stdout.encoding or 'utf-8', sys.stdout.errors or 'strict'))
+    while payload:
+        payload = payload[os.write(1, payload):]
+
+# 被检查的路径只构造一次（相对于项目根目录，即运行脚本时的当前目录）
+ROOT = pathlib.Path('.')
+BIN_DIR = ROOT / 'bin'
+CALCULATOR_DIR = ROOT / 'mcp' / 'calculator'
+WRAPPER = BIN_DIR / 'calculator-mcp'
+SERVER = CALCULATOR_DIR / 'calculator_mcp.py'
+REQUIREMENTS = CALCULATOR_DIR / 'requirements.txt'
+
+# 需要检查的目录 -> 其中被检查的文件；这些目录各 scandir 一次，不再逐个文件解析路径
+EXPECTED_ENTRIES = {
+    BIN_DIR: {WRAPPER.name},
+    CALCULATOR_DIR: {SERVER.name, REQUIREMENTS.name},
+}
+
+def display_path(path):
+    '''输出中显示的路径：子目录中的文件保留 "./" 前缀（pathlib 会去掉它），与之前的输出一致'''
+    if path.parent == ROOT:
+        return str(path)
+    return f"./{path.as_posix()}"
+
+@functools.lru_cache(maxsize=None)
+def _scan_dir(dirpath):
+    '''一次 scandir 取得目录下的所有条目（name -> DirEntry），目录无法读取时返回空字典'''
+    try:
+        with os.scandir(dirpath) as it:
+            return {entry.name: entry for entry in it}
+    except OSError:
+        return {}
+
+@functools.lru_cache(maxsize=None)
+def _stat_entry(filepath):
+    '''os.stat 的缓存版本：同一路径在一次运行中只 stat 一次
+
+    文件不存在的结果同样缓存（返回 None），其他错误不缓存
+    '''
+    try:
+        if filepath.parent in EXPECTED_ENTRIES:
+            entry = _scan_dir(filepath.parent).get(filepath.name)
+            if entry is None:
+                return None
+            # DirEntry 会缓存 stat 结果
+            return entry.stat()
+        return filepath.stat()
+    except FileNotFoundError:
+        return None
+
+def _stat_cached(filepath):
+    '''返回缓存的 stat 结果，文件不存在时抛出 FileNotFoundError'''
+    st = _stat_entry(filepath)
+    if st is None:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(filepath))
+    return st
+
+def _stat_or_none(filepath):
+    '''返回缓存的 stat 结果，文件不存在（或无法访问）时返回 None'''
+    try:
+        return _stat_entry(filepath)
+    except OSError:
+        return None
+
+def _load_json(filepath):
+    '''解析 JSON 文件（按字节读取；有 orjson 时优先使用）'''
+    raw = filepath.read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # 交给标准库重新解析：错误信息与之前一致，NaN 等 orjson 不接受的写法也照常通过
+            pass
+    return json.loads(raw.decode('utf-8'))
+
+# 已知 MCP 服务器名称 -> 期望的启动命令
+EXPECTED_COMMANDS = {
+    'calculator': './bin/calculator-mcp',
+}
+
+def _read_head(filepath, size):
+    '''用一次 os.read 读取文件开头最多 size 个字节（不构造文本流）'''
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+# 文件检查的输出格式；成功时按检查类型追加 _SUFFIX 中的说明
+OK_FMT = "✅ {d}: {p}{s}"
+FAIL_FMT = "❌ {d}: {p} ({err})"
+_SUFFIX = {
+    None: "",
+    'exec': " (可执行)",
+    'json': " (JSON 语法正确)",
+    'py': " (Python 语法正确)",
+}
+
+def log_ok(description, filepath, kind=None):
+    '''记录一条文件检查成功的输出'''
+    log(OK_FMT.format(d=description, p=display_path(filepath), s=_SUFFIX[kind]))
+
+def log_fail(description, filepath, err):
+    '''记录一条文件检查失败的输出'''
+    log(FAIL_FMT.format(d=description, p=display_path(filepath), err=err))
+
+@dataclass(slots=True)
+class CheckResult:
+    '''一项检查的结果；fatal 表示后续依赖它的检查已没有意义，应当跳过'''
+    ok: bool
+    fatal: bool = False
+    detail: str = ""
+    
+    def __bool__(self):
+        return self.ok
 
 def check_file_exists(filepath, description):
     '''检查文件是否存在'''
-    if os.path.exists(filepath):
-        print(f"✅ {description}: {filepath}")
-        return True
+    if _stat_or_none(filepath) is not None:
+        log_ok(description, filepath)
+        return CheckResult(True)
     else:
-        print(f"❌ {description}: {filepath} (文件不存在)")
-        return False
+        log_fail(description, filepath, "文件不存在")
+        return CheckResult(False, detail="文件不存在")
 
-def check_file_executable(filepath, description):
-    '''检查文件是否可执行'''
-    if not os.path.exists(filepath):
-        print(f"❌ {description}: {filepath} (文件不存在)")
-        return False
+def check_present_and_executable(filepath, description):
+    '''检查文件是否存在且可执行（只查询一次 stat）；文件不存在时返回 fatal 结果'''
+    if _stat_or_none(filepath) is None:
+        log_fail(description, filepath, "文件不存在")
+        return CheckResult(False, fatal=True, detail="文件不存在")
+    log_ok(description, filepath)
     
-    # 检查执行权限
-    st = os.stat(filepath)
-    if st.st_mode & stat.S_IEXEC:
-        print(f"✅ {description}: {filepath} (可执行)")
-        return True
+    # 检查当前用户的执行权限（而不只是属主的执行位）
+    if os.access(filepath, os.X_OK):
+        log_ok(description, filepath, 'exec')
+        return CheckResult(True)
     else:
-        print(f"❌ {description}: {filepath} (不可执行)")
-        return False
+        log_fail(description, filepath, "不可执行")
+        return CheckResult(False, detail="不可执行")
 
 def check_json_syntax(filepath, description):
-    '''检查 JSON 文件语法'''
-    if not os.path.exists(filepath):
-        print(f"❌ {description}: {filepath} (文件不存在)")
-        return False
+    '''检查 JSON 文件语法，成功时返回解析结果（供后续检查复用），失败时返回 None'''
+    if _stat_or_none(filepath) is None:
+        log_fail(description, filepath, "文件不存在")
+        return None
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        print(f"✅ {description}: {filepath} (JSON 语法正确)")
-        return True
+        data = _load_json(filepath)
+        log_ok(description, filepath, 'json')
+        return data
     except json.JSONDecodeError as e:
-        print(f"❌ {description}: {filepath} (JSON 语法错误: {e})")
-        return False
+        log_fail(description, filepath, f"JSON 语法错误: {e}")
+        return None
     except Exception as e:
-        print(f"❌ {description}: {filepath} (读取错误: {e})")
-        return False
+        log_fail(description, filepath, f"读取错误: {e}")
+        return None
 
 def check_python_script(filepath, description):
-    '''检查 Python 脚本语法'''
-    if not os.path.exists(filepath):
-        print(f"❌ {description}: {filepath} (文件不存在)")
-        return False
+    '''检查 Python 脚本语法（在当前进程内编译，不启动子进程）'''
+    if _stat_or_none(filepath) is None:
+        log_fail(description, filepath, "文件不存在")
+        return CheckResult(False, detail="文件不存在")
     
     try:
-        result = subprocess.run(
-            [sys.executable, "-m", "py_compile", filepath],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            print(f"✅ {description}: {filepath} (Python 语法正确)")
-            return True
-        else:
-            print(f"❌ {description}: {filepath} (Python 语法错误)")
-            print(f"   错误信息: {result.stderr}")
-            return False
+        source = filepath.read_bytes()
+        compile(source, display_path(filepath), 'exec', dont_inherit=True)
+        log_ok(description, filepath, 'py')
+        return CheckResult(True)
+    except (SyntaxError, ValueError) as e:
+        # 与 python -m py_compile 输出相同格式的错误信息
+        error = py_compile.PyCompileError(type(e), e, display_path(filepath))
+        log_fail(description, filepath, "Python 语法错误")
+        log(f"   错误信息: {error.msg}")
+        return CheckResult(False, detail=error.msg)
     except Exception as e:
-        print(f"❌ {description}: {filepath} (检查错误: {e})")
-        return False
+        log_fail(description, filepath, f"检查错误: {e}")
+        return CheckResult(False, detail=str(e))
 
-def check_mcp_server_config(config_path):
-    '''检查 MCP 配置文件（mcp_servers）'''
-    if not os.path.exists(config_path):
-        print(f"❌ 配置文件不存在: {config_path}")
-        return False
+def check_mcp_server_config(config_path, data=None):
+    '''检查 MCP 配置文件（mcp_servers）；data 为已解析的内容时不再读取文件
+
+    配置文件不存在或无法解析时返回 fatal 结果，依赖它的服务器检查随之跳过
+    '''
+    if data is None and _stat_or_none(config_path) is None:
+        log(f"❌ 配置文件不存在: {config_path}")
+        return CheckResult(False, fatal=True, detail="配置文件不存在")
     
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        if data is None:
+            data = _load_json(config_path)
+        config = data
         
-        print(f"📋 配置文件: {config_path}")
+        log(f"📋 配置文件: {config_path}")
         
         # 检查 MCP 服务器配置
         if 'mcp_servers' in config:
-            print(f"  ✅ mcp_servers: 找到 {len(config['mcp_servers'])} 个服务器")
+            log(f"  ✅ mcp_servers: 找到 {len(config['mcp_servers'])} 个服务器")
             
             for i, server in enumerate(config['mcp_servers']):
-                print(f"   服务器 #{i+1}:")
-                print(f"     name: {server.get('name', '(缺失)')}")
-                print(f"     transport: {server.get('transport', '(缺失)')}")
-                print(f"     command: {server.get('command', '(缺失)')}")
+                log(f"   服务器 #{i+1}:")
+                log(f"     name: {server.get('name', '(缺失)')}")
+                log(f"     transport: {server.get('transport', '(缺失)')}")
+                log(f"     command: {server.get('command', '(缺失)')}")
                 
-                # 检查 calculator 服务器
-                if server.get('name') == 'calculator':
+                # 检查已知服务器的启动命令
+                name = server.get('name')
+                expected = EXPECTED_COMMANDS.get(name) if isinstance(name, str) else None
+                if expected is not None:
                     command = server.get('command', '')
-                    if command == './bin/calculator-mcp':
-                        print(f"     ✅ calculator 服务器配置正确")
+                    if command == expected:
+                        log(f"     ✅ {name} 服务器配置正确")
                     else:
-                        print(f"     ⚠️  calculator 服务器命令可能不正确: {command}")
+                        log(f"     ⚠️  {name} 服务器命令可能不正确: {command}")
         else:
-            print(f"  ⚠️  mcp_servers: (缺失 - 将无法使用 MCP 服务器)")
+            log(f"  ⚠️  mcp_servers: (缺失 - 将无法使用 MCP 服务器)")
         
-        return True
+        return CheckResult(True)
         
     except Exception as e:
-        print(f"❌ 读取配置文件错误: {e}")
-        return False
+        log(f"❌ 读取配置文件错误: {e}")
+        return CheckResult(False, fatal=True, detail=str(e))
 
 def check_calculator_mcp_server():
     '''检查 Calculator MCP 服务器'''
-    print("\n🔧 检查 Calculator MCP 服务器")
+    log("\n🔧 检查 Calculator MCP 服务器")
     
     # 检查包装器脚本
-    wrapper_path = "./bin/calculator-mcp"
-    if not check_file_exists(wrapper_path, "包装器脚本"):
-        return False
+    result = check_present_and_executable(WRAPPER, "包装器脚本")
+    if result.fatal:
+        return result
     
-    if not check_file_executable(wrapper_path, "包装器脚本"):
-        print("  尝试修复权限...")
+    if not result:
+        log("  尝试修复权限...")
         try:
-            os.chmod(wrapper_path, 0o755)
-            print("  权限已修复")
+            os.chmod(WRAPPER, 0o755)
+            # 权限已变，之前缓存的 stat 结果作废
+            _stat_entry.cache_clear()
+            _scan_dir.cache_clear()
+            log("  权限已修复")
         except Exception as e:
-            print(f"  修复权限失败: {e}")
+            log(f"  修复权限失败: {e}")
     
     # 检查主服务器文件
-    server_path = "./mcp/calculator/calculator_mcp.py"
-    if not check_file_exists(server_path, "MCP 服务器文件"):
-        return False
+    result = check_file_exists(SERVER, "MCP 服务器文件")
+    if not result:
+        return result
     
-    if not check_python_script(server_path, "MCP 服务器文件"):
-        return False
+    result = check_python_script(SERVER, "MCP 服务器文件")
+    if not result:
+        return result
     
     # 检查依赖文件
-    requirements_path = "./mcp/calculator/requirements.txt"
-    if check_file_exists(requirements_path, "依赖文件"):
-        print(f"  📦 依赖文件: {requirements_path}")
+    if check_file_exists(REQUIREMENTS, "依赖文件"):
+        log(f"  📦 依赖文件: {display_path(REQUIREMENTS)}")
         try:
-            with open(requirements_path, 'r') as f:
-                deps = f.read().strip().split('\n')
-                for dep in deps:
-                    if dep.strip():
-                        print(f"    - {dep.strip()}")
+            # 依赖文件通常不足一页，按 stat 得到的大小一次读完
+            size = max(_stat_or_none(REQUIREMENTS).st_size, 4096)
+            deps = _read_head(REQUIREMENTS, size).decode('utf-8').strip().split('\n')
+            for dep in deps:
+                if dep.strip():
+                    log(f"    - {dep.strip()}")
         except:
             pass
     
-    return True
+    return CheckResult(True)
 
 def check_python_dependencies():
     '''检查 Python 依赖'''
-    print("\n🐍 检查 Python 依赖")
+    log("\n🐍 检查 Python 依赖")
     
     dependencies = ['mcp', 'pydantic', 'httpx']
     
+    # 只查找模块，不执行其顶层代码
     for dep in dependencies:
-        try:
-            __import__(dep)
-            print(f"  ✅ {dep}: 已安装")
-        except ImportError:
-            print(f"  ❌ {dep}: 未安装")
-            print(f"     安装命令: pip install {dep}")
+        if importlib.util.find_spec(dep) is not None:
+            log(f"  ✅ {dep}: 已安装")
+        else:
+            log(f"  ❌ {dep}: 未安装")
+            log(f"     安装命令: pip install {dep}")
     
     # 检查 numpy (可选)
-    try:
-        import numpy
-        print(f"  ✅ numpy: 已安装 (可选)")
-    except ImportError:
-        print(f"  ⚠️  numpy: 未安装 (可选依赖)")
+    if importlib.util.find_spec("numpy") is not None:
+        log(f"  ✅ numpy: 已安装 (可选)")
+    else:
+        log(f"  ⚠️  numpy: 未安装 (可选依赖)")
 
 def run_quick_test():
     '''运行快速测试'''
-    print("\n🧪 运行快速测试")
+    log("\n🧪 运行快速测试")
     
     # 测试包装器脚本
-    wrapper_path = "./bin/calculator-mcp"
-    if os.path.exists(wrapper_path):
-        print("  测试包装器脚本...")
+    if _stat_or_none(WRAPPER) is not None:
+        log("  测试包装器脚本...")
         try:
             # 检查 shebang
-            with open(wrapper_path, 'r') as f:
-                first_line = f.readline().strip()
-                if first_line == "#!/usr/bin/env bash":
-                    print("    ✅ Shebang 正确")
-                else:
-                    print(f"    ⚠️  Shebang 可能不正确: {first_line}")
+            # 只读取开头的 128 个字节，取第一行
+            head = _read_head(WRAPPER, 128)
+            first_line = head.split(b"\n", 1)[0].decode('utf-8', 'replace').strip()
+            if first_line == "#!/usr/bin/env bash":
+                log("    ✅ Shebang 正确")
+            else:
+                log(f"    ⚠️  Shebang 可能不正确: {first_line}")
             
-            # 测试导入
-            test_code = """
-import sys
-sys.path.insert(0, './mcp/calculator')
-try:
-    from calculator_mcp import mcp
-    print("    ✅ 可以导入 MCP 服务器")
-except Exception as e:
-    print(f"    ❌ 导入错误: {e}")
-"""
-            result = subprocess.run(
-                [sys.executable, "-c", test_code],
-                capture_output=True,
-                text=True,
-                cwd="."
-            )
-            if result.stdout:
-                print(result.stdout.strip())
+            # 测试导入（在当前进程内加载，不再启动新的解释器）
+            try:
+                spec = importlib.util.spec_from_file_location("calculator_mcp", display_path(SERVER))
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                if not hasattr(module, "mcp"):
+                    raise ImportError(f"cannot import name 'mcp' from 'calculator_mcp' ({display_path(SERVER)})")
+                log("✅ 可以导入 MCP 服务器")
+            except (Exception, SystemExit) as e:
+                log(f"❌ 导入错误: {e}")
             
         except Exception as e:
-            print(f"    ❌ 测试错误: {e}")
+            log(f"    ❌ 测试错误: {e}")
     else:
-        print("  ⚠️  包装器脚本不存在，跳过测试")
+        log("  ⚠️  包装器脚本不存在，跳过测试")
+
+def _run_buffered(func, *args):
+    '''在线程中运行一项检查，返回 (结果, 该检查输出的行)'''
+    _local.out = []
+    try:
+        return func(*args), _local.out
+    finally:
+        _local.out = None
 
 def main():
     '''主验证函数'''
-    print("=" * 60)
-    print("MCP 服务器集成验证")
-    print("=" * 60)
+    log("=" * 60)
+    log("MCP 服务器集成验证")
+    log("=" * 60)
     
     # 获取当前目录
     current_dir = os.getcwd()
-    print(f"当前目录: {current_dir}")
+    log(f"当前目录: {current_dir}")
+    flush_log()
     
-    # 检查配置文件
-    print("\n📄 检查配置文件")
+    # 各项检查（都是文件等待）在线程池中并行执行，输出按提交顺序打印，与串行执行时一致；
+    # 服务器相关的检查依赖 mcp.json，等 mcp.json 检查通过后再提交
     config_files = ['config.json', 'config.exm.json', 'mcp.json', 'mcp.exm.json']
-    for config_file in config_files:
-        check_json_syntax(config_file, f"配置文件 {config_file}")
     
-    # 检查 MCP 配置文件内容
-    check_mcp_server_config("mcp.json")
-    
-    # 检查 Calculator MCP 服务器
-    calculator_ok = check_calculator_mcp_server()
-    
-    # 检查 Python 依赖
-    check_python_dependencies()
-    
-    # 运行快速测试
-    run_quick_test()
+    log("\n📄 检查配置文件")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        json_futures = [
+            pool.submit(_run_buffered, check_json_syntax, ROOT / config_file, f"配置文件 {config_file}")
+            for config_file in config_files
+        ]
+        dependencies_future = pool.submit(_run_buffered, check_python_dependencies)  # 检查 Python 依赖
+        
+        parsed = {}
+        for config_file, future in zip(config_files, json_futures):
+            parsed[config_file], lines = future.result()
+            _out.extend(lines)
+        
+        # 检查 MCP 配置文件内容（复用上面解析好的 mcp.json；在主线程中直接记录）
+        config_result = check_mcp_server_config(ROOT / "mcp.json", parsed["mcp.json"])
+        flush_log()
+        
+        if config_result.fatal:
+            log("\n⚠️  mcp.json 不可用，跳过 Calculator MCP 服务器检查和快速测试")
+            calculator_ok = CheckResult(False, detail=config_result.detail)
+            later_futures = [dependencies_future]
+        else:
+            calculator_future = pool.submit(_run_buffered, check_calculator_mcp_server)  # 检查 Calculator MCP 服务器
+            later_futures = [
+                calculator_future,
+                dependencies_future,
+                pool.submit(_run_buffered, run_quick_test)              # 运行快速测试
+            ]
+        
+        for future in later_futures:
+            _out.extend(future.result()[1])
+            flush_log()
+        if not config_result.fatal:
+            calculator_ok = calculator_future.result()[0]
     
     # 总结
-    print("\n" + "=" * 60)
-    print("验证总结")
-    print("=" * 60)
+    log("\n" + "=" * 60)
+    log("验证总结")
+    log("=" * 60)
     
     if calculator_ok:
-        print("✅ Calculator MCP 服务器配置基本正确")
-        print("\n下一步:")
-        print("1. 安装依赖: pip install -r mcp/calculator/requirements.txt")
-        print("2. 测试服务器: cd mcp/calculator && python test_calculator.py")
-        print("3. 启动代理: ./bin/XingheBot chat")
-        print("4. 测试工具: 询问 'What calculator tools are available?'")
+        log("✅ Calculator MCP 服务器配置基本正确")
+        log("\n下一步:")
+        log("1. 安装依赖: pip install -r mcp/calculator/requirements.txt")
+        log("2. 测试服务器: cd mcp/calculator && python test_calculator.py")
+        log("3. 启动代理: ./bin/XingheBot chat")
+        log("4. 测试工具: 询问 'What calculator tools are available?'")
     else:
-        print("❌ 存在配置问题，请检查上述错误")
+        log("❌ 存在配置问题，请检查上述错误")
     
-    print("\n详细指南请查看:")
-    print("- MCP_INTEGRATION_GUIDE.md")
-    print("- mcp/calculator/README.md")
-    print("- mcp/calculator/INSTALL.md")
+    log("\n详细指南请查看:")
+    log("- MCP_INTEGRATION_GUIDE.md")
+    log("- mcp/calculator/README.md")
+    log("- mcp/calculator/INSTALL.md")
+    flush_log()
 
 if __name__ == "__main__":
     main()